@@ -0,0 +1,338 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 Richard Hull and contributors
+# See LICENSE.rst for details.
+
+"""
+Measures the throughput of every emulator device, and of every transform on
+each backend, across a range of display sizes, image modes and contrast
+levels.
+
+Each case runs in a fresh process, and reports:
+
+* ``fps`` - frames displayed per second
+* ``alloc`` - mean peak bytes allocated (as traced by :py:mod:`tracemalloc`)
+  while displaying a frame; memory allocated by SDL for pygame surfaces is
+  not included
+* ``rss`` - peak resident set size of the process, in KiB
+
+Results may be saved as JSON with ``--save``, and later runs checked against
+them with ``--baseline``, which exits with a non-zero status if any case has
+slowed down (or allocates more) by more than ``--tolerance``::
+
+    $ python benchmarks/run.py --save baseline.json
+    $ python benchmarks/run.py --baseline baseline.json
+
+To check against a baseline saved on a different machine (as CI does with
+``benchmarks/baseline.json``), add ``--relative``: the frame rates in the
+baseline are then scaled by how fast the reference case runs on each.
+
+Cases can be selected with ``-k``: only those whose name contains every one
+of the given substrings are run, e.g. ``-k transform/ -k 128x64``.
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import platform
+import itertools
+import tracemalloc
+import multiprocessing
+from unittest.mock import patch
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+import PIL
+from PIL import Image, ImageDraw
+
+from luma.emulator import device
+
+
+SIZES = [(128, 32), (128, 64), (256, 64), (320, 240)]
+MODES = ["1", "L", "RGB"]
+CONTRASTS = [255, 128]
+TRANSFORMS = ["none", "identity", "scale2x", "smoothscale", "led_matrix", "seven_segment"]
+BACKENDS = ["pygame", "pil"]
+DEVICES = ["capture", "gifanim", "animation", "headless", "pygame", "asciiart", "asciiblock"]
+
+# Number of distinct frames cycled through, so that successive frames differ
+FRAMES = 8
+
+# Case taken as a measure of the speed of the machine, for --relative
+REFERENCE = "transform/identity/pil/128x64/RGB/255"
+
+
+def cases():
+    """
+    Yields the name and parameters of every benchmark case.
+    """
+    for transform, backend, (w, h), mode, contrast in itertools.product(
+            TRANSFORMS, BACKENDS, SIZES, MODES, CONTRASTS):
+        name = f"transform/{transform}/{backend}/{w}x{h}/{mode}/{contrast}"
+        yield name, dict(kind="transform", name=transform, backend=backend,
+                         size=(w, h), mode=mode, contrast=contrast)
+
+    for name, (w, h), mode, contrast in itertools.product(DEVICES, SIZES, MODES, CONTRASTS):
+        for backend in (["pygame"] if name == "pygame" else BACKENDS):
+            yield f"device/{name}/{backend}/{w}x{h}/{mode}/{contrast}", \
+                dict(kind="device", name=name, backend=backend,
+                     size=(w, h), mode=mode, contrast=contrast)
+
+
+def frames(size, mode):
+    """
+    Returns a list of images of a box, a circle and some text, with a bar
+    moving across them from one image to the next.
+    """
+    w, h = size
+    result = []
+    for i in range(FRAMES):
+        im = Image.new("RGB", size)
+        draw = ImageDraw.Draw(im)
+        draw.rectangle((0, 0, w - 1, h - 1), outline="white")
+        draw.ellipse((2, 2, h - 3, h - 3), fill="red", outline="blue")
+        draw.text((h + 2, 2), "Hello World", fill="yellow")
+        x = (w * i) // FRAMES
+        draw.rectangle((x, h // 2, x + w // FRAMES, h - 3), fill="green")
+        result.append(im.convert(mode))
+    return result
+
+
+class _screen(object):
+    """
+    Stands in for a curses window, discarding all output.
+    """
+    def getmaxyx(self):
+        return (40, 100)
+
+    def addstr(self, *args):
+        pass
+
+    def erase(self):
+        pass
+
+    def refresh(self):
+        pass
+
+
+def _terminal(stack):
+    """
+    Fakes a 100x40 terminal, sending anything written to it to
+    :py:data:`os.devnull`.
+    """
+    import curses
+    import struct
+
+    noop = lambda *args: None
+    devnull = open(os.devnull, "w")
+    stack.append(devnull)
+    stack.append(patch.object(sys, "stdout", devnull))
+    stack.append(patch("fcntl.ioctl", return_value=struct.pack("HHHH", 40, 100, 0, 0)))
+    stack.append(patch.multiple(curses, initscr=lambda: _screen(), start_color=noop,
+                                use_default_colors=noop, init_pair=noop, noecho=noop,
+                                cbreak=noop, nocbreak=noop, echo=noop, endwin=noop,
+                                color_pair=lambda n: n << 8))
+    stack.append(patch.object(curses, "COLORS", 256, create=True))
+    for p in stack[1:]:
+        p.start()
+
+
+def create(params, tmpdir, stack):
+    """
+    Returns a function which displays an image on the device (or transforms
+    it) described by ``params``.
+    """
+    w, h = params["size"]
+    mode = "1" if params["mode"] == "1" else "RGB"
+    backend = params["backend"]
+
+    if params["kind"] == "transform":
+        transform = params["name"]
+        scale = 1 if transform == "none" else 2
+        emulator = device.emulator(w, h, 0, mode, transform, scale, backend)
+        alpha = params["contrast"] / 255.0
+        if backend == "pil":
+            return emulator, lambda image: emulator.to_image(image, alpha=alpha)
+        else:
+            return emulator, lambda image: emulator.to_surface(image, alpha=alpha, reuse=True)
+
+    kwargs = dict(width=w, height=h, mode=mode)
+    name = params["name"]
+    if name != "pygame":
+        kwargs["backend"] = backend
+    if name == "capture":
+        kwargs["file_template"] = os.path.join(tmpdir, "luma_{0:06}.png")
+    elif name == "gifanim":
+        kwargs["filename"] = os.path.join(tmpdir, "luma_anim.gif")
+        kwargs["streaming"] = True
+    elif name == "animation":
+        kwargs["filename"] = os.path.join(tmpdir, "luma_anim.y4m")
+    elif name == "pygame":
+        kwargs["frame_rate"] = 0
+    elif name in ("asciiart", "asciiblock"):
+        _terminal(stack)
+
+    emulator = getattr(device, name)(**kwargs)
+    emulator.contrast(params["contrast"])
+    return emulator, emulator.display
+
+
+def run(params, min_time, max_frames, alloc_frames):
+    """
+    Runs a single case, returning its results.
+    """
+    import tempfile
+
+    images = frames(params["size"], params["mode"])
+    stack = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        emulator, display = create(params, tmpdir, stack)
+        try:
+            # Warm up, so that one-off costs (such as caches) are excluded
+            for image in images:
+                display(image)
+
+            count = 0
+            start = time.perf_counter()
+            elapsed = 0
+            while elapsed < min_time and count < max_frames:
+                display(images[count % FRAMES])
+                count += 1
+                elapsed = time.perf_counter() - start
+
+            rss = None
+            if resource is not None:
+                rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                if sys.platform == "darwin":
+                    rss //= 1024
+
+            allocated = 0
+            tracemalloc.start()
+            for image in images[:alloc_frames]:
+                tracemalloc.reset_peak()
+                before, _ = tracemalloc.get_traced_memory()
+                display(image)
+                _, peak = tracemalloc.get_traced_memory()
+                allocated += peak - before
+            tracemalloc.stop()
+        finally:
+            if params["name"] == "gifanim":
+                emulator.write_animation()
+            emulator.cleanup()
+            for p in reversed(stack):
+                p.close() if isinstance(p, io.IOBase) else p.stop()
+
+    return {
+        "fps": count / elapsed,
+        "alloc": allocated // min(alloc_frames, FRAMES),
+        "rss": rss,
+    }
+
+
+def _run(args):
+    return run(*args)
+
+
+def compare(name, result, baseline, tolerance, speed=1.0):
+    """
+    Returns a description of each way in which ``result`` is worse than
+    ``baseline``, where this machine runs ``speed`` times as fast as the one
+    which produced the baseline.
+    """
+    problems = []
+    expected = baseline["fps"] * speed
+    if result["fps"] < expected * (1 - tolerance):
+        problems.append(f"fps {expected:.1f} -> {result['fps']:.1f}")
+    # Allow some slack for small allocations, which vary between runs
+    if result["alloc"] > baseline["alloc"] * (1 + tolerance) + 4096:
+        problems.append(f"alloc {baseline['alloc']} -> {result['alloc']}")
+    return problems
+
+
+def environment():
+    import pygame
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "pillow": PIL.__version__,
+        "pygame": pygame.version.ver,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="luma.emulator benchmarks")
+    parser.add_argument("-k", dest="select", action="append", default=[],
+                        help="only run cases whose name contains this substring (may be repeated)")
+    parser.add_argument("--list", action="store_true", help="list the cases, without running them")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="time to spend displaying frames in each case, in seconds (default: 0.2)")
+    parser.add_argument("--max-frames", type=int, default=1000,
+                        help="maximum number of frames to display in each case (default: 1000)")
+    parser.add_argument("--alloc-frames", type=int, default=FRAMES,
+                        help=f"number of frames to trace allocations over (default: {FRAMES})")
+    parser.add_argument("--save", metavar="FILE", help="write the results to FILE as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="compare the results against FILE")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="permitted fractional slowdown or growth in allocations (default: 0.25)")
+    parser.add_argument("--relative", action="store_true",
+                        help=f"scale the baseline frame rates by the speed of {REFERENCE} (which is always run)")
+    args = parser.parse_args(argv)
+
+    selected = [(name, params) for name, params in cases()
+                if all(s in name for s in args.select)]
+    if args.relative:
+        # Run the reference case first, so the speed is known for the rest
+        selected = [(name, params) for name, params in cases() if name == REFERENCE] + \
+            [(name, params) for name, params in selected if name != REFERENCE]
+    if args.list:
+        for name, _ in selected:
+            print(name)
+        return 0
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as fp:
+            baseline = json.load(fp)["results"]
+
+    results = {}
+    regressions = 0
+    speed = 1.0
+    print(f"{'case':<48} {'fps':>10} {'alloc KiB':>10} {'rss KiB':>10}")
+    with multiprocessing.Pool(1, maxtasksperchild=1) as pool:
+        jobs = [(params, args.min_time, args.max_frames, args.alloc_frames)
+                for _, params in selected]
+        for (name, _), result in zip(selected, pool.imap(_run, jobs)):
+            results[name] = result
+            if args.relative and name == REFERENCE and name in baseline:
+                speed = result["fps"] / baseline[name]["fps"]
+            problems = compare(name, result, baseline[name], args.tolerance, speed) \
+                if name in baseline else []
+            regressions += bool(problems)
+            print(f"{name:<48} {result['fps']:>10.1f} {result['alloc'] / 1024:>10.1f} "
+                  f"{result['rss'] or 0:>10} {'REGRESSED: ' + ', '.join(problems) if problems else ''}")
+
+    if args.save:
+        with open(args.save, "w") as fp:
+            json.dump({"environment": environment(), "results": results},
+                      fp, indent=2, sort_keys=True)
+
+    if args.relative:
+        print(f"Frame rates expected at {speed:.2f}x those of the baseline")
+    if regressions:
+        print(f"{regressions} case(s) regressed by more than {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
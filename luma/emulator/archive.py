@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 Richard Hull and contributors
+# See LICENSE.rst for details.
+
+import io
+import os
+import time
+import struct
+import tarfile
+import zipfile
+import threading
+
+from PIL import Image
+
+
+__all__ = ["archive_writer", "archive_reader"]
+
+
+FORMATS = {
+    ".zip": "zip",
+    ".tar": "tar",
+    ".frames": "frames"
+}
+
+# Layout of a ``frames`` file: the magic number, then each frame as a record
+# header (frame number & length) followed by its data, then on closing, an
+# index entry (frame number & record offset) per frame and a footer pointing
+# at the first entry.
+_MAGIC = b"LUMAFRM1"
+_RECORD = struct.Struct("<II")
+_ENTRY = struct.Struct("<IQ")
+_FOOTER = struct.Struct("<QI4s")
+_FOOTER_MAGIC = b"LIDX"
+
+# Frame numbers are recorded against each member of a zip or tar file
+_PAX_FRAME = "LUMA.frame"
+
+
+def _format(filename, format):
+    if format is None:
+        format = FORMATS.get(os.path.splitext(filename)[1].lower())
+    assert format in ("zip", "tar", "frames"), f"Unsupported archive format: {format}"
+    return format
+
+
+class archive_writer(object):
+    """
+    Appends numbered frames (typically PNG-encoded) to a single file, rather
+    than writing each to a file of its own, in one of the following formats:
+
+    * ``"zip"`` - a zip file, with each frame stored uncompressed
+    * ``"tar"`` - a (POSIX pax) tar file
+    * ``"frames"`` - a sequence of frames followed by an index of their
+      offsets, which can still be read (more slowly) if the writer was not
+      closed
+
+    Unless ``format`` is given, it is chosen by the extension of
+    ``filename``: ``.zip``, ``.tar`` or ``.frames``. Frames may be added from
+    any thread, and in any order; use :py:class:`archive_reader` to read them
+    back by frame number.
+
+    :param filename: The file to write.
+    :type filename: str
+    :param format: One of ``"zip"``, ``"tar"`` or ``"frames"``.
+    :type format: str
+
+    .. versionadded:: 1.8.0
+    """
+    def __init__(self, filename, format=None):
+        self._format = _format(filename, format)
+        self._lock = threading.Lock()
+        self._index = []
+        if self._format == "zip":
+            self._file = zipfile.ZipFile(filename, "w", zipfile.ZIP_STORED)
+        elif self._format == "tar":
+            self._file = tarfile.open(filename, "w", format=tarfile.PAX_FORMAT)
+        else:
+            self._file = open(filename, "wb")
+            self._file.write(_MAGIC)
+        self.frames = 0
+
+    def add(self, number, name, data):
+        """
+        Appends a frame.
+
+        :param number: The frame number.
+        :type number: int
+        :param name: The frame's file name within a zip or tar file.
+        :type name: str
+        :param data: The (encoded) frame.
+        :type data: bytes
+        """
+        with self._lock:
+            if self._format == "zip":
+                info = zipfile.ZipInfo(name, time.localtime()[:6])
+                info.comment = str(number).encode("ascii")
+                self._file.writestr(info, data)
+            elif self._format == "tar":
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                info.mtime = time.time()
+                info.pax_headers = {_PAX_FRAME: str(number)}
+                self._file.addfile(info, io.BytesIO(data))
+            else:
+                self._index.append((number, self._file.tell()))
+                self._file.write(_RECORD.pack(number, len(data)))
+                self._file.write(data)
+            self.frames += 1
+
+    def close(self):
+        """
+        Finishes off the file. No further frames may be added afterwards.
+        """
+        with self._lock:
+            if self._format == "frames":
+                offset = self._file.tell()
+                self._file.write(b"".join(_ENTRY.pack(number, start) for number, start in self._index))
+                self._file.write(_FOOTER.pack(offset, len(self._index), _FOOTER_MAGIC))
+            self._file.close()
+
+
+class archive_reader(object):
+    """
+    Reads frames written by an :py:class:`archive_writer` (or frames from any
+    zip or tar file, numbered from 1 in the order they appear), giving random
+    access to them by frame number.
+
+    :param filename: The file to read.
+    :type filename: str
+    :param format: One of ``"zip"``, ``"tar"`` or ``"frames"``, if it cannot
+        be told from the extension of ``filename``.
+    :type format: str
+
+    .. versionadded:: 1.8.0
+    """
+    def __init__(self, filename, format=None):
+        self._format = _format(filename, format)
+        self._index = {}
+        if self._format == "zip":
+            self._file = zipfile.ZipFile(filename, "r")
+            for n, info in enumerate(self._file.infolist(), start=1):
+                self._index[int(info.comment) if info.comment else n] = info
+        elif self._format == "tar":
+            self._file = tarfile.open(filename, "r")
+            for n, info in enumerate(self._file.getmembers(), start=1):
+                self._index[int(info.pax_headers.get(_PAX_FRAME, n))] = info
+        else:
+            self._file = open(filename, "rb")
+            assert self._file.read(len(_MAGIC)) == _MAGIC, f"Not a frames file: {filename}"
+            self._read_index()
+
+    def _read_index(self):
+        file_size = self._file.seek(0, os.SEEK_END)
+        if file_size >= len(_MAGIC) + _FOOTER.size:
+            self._file.seek(-_FOOTER.size, os.SEEK_END)
+            offset, count, magic = _FOOTER.unpack(self._file.read(_FOOTER.size))
+            if magic == _FOOTER_MAGIC and offset + count * _ENTRY.size + _FOOTER.size == file_size:
+                self._file.seek(offset)
+                table = self._file.read(count * _ENTRY.size)
+                for number, start in _ENTRY.iter_unpack(table):
+                    self._index[number] = start
+                return
+
+        # The writer was not closed, so find each (complete) record in turn
+        start = len(_MAGIC)
+        while start + _RECORD.size <= file_size:
+            self._file.seek(start)
+            number, length = _RECORD.unpack(self._file.read(_RECORD.size))
+            if start + _RECORD.size + length > file_size:
+                break
+            self._index[number] = start
+            start += _RECORD.size + length
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, number):
+        return number in self._index
+
+    def numbers(self):
+        """
+        :returns: The number of every frame held, in ascending order.
+        :rtype: list
+        """
+        return sorted(self._index)
+
+    def read(self, number):
+        """
+        :returns: The (encoded) frame numbered ``number``.
+        :rtype: bytes
+        :raises KeyError: If there is no such frame.
+        """
+        info = self._index[number]
+        if self._format == "zip":
+            return self._file.read(info)
+        elif self._format == "tar":
+            return self._file.extractfile(info).read()
+        else:
+            self._file.seek(info)
+            _, length = _RECORD.unpack(self._file.read(_RECORD.size))
+            return self._file.read(length)
+
+    def frame(self, number):
+        """
+        :returns: The image of the frame numbered ``number``.
+        :rtype: PIL.Image.Image
+        :raises KeyError: If there is no such frame.
+        """
+        image = Image.open(io.BytesIO(self.read(number)))
+        image.load()
+        return image
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
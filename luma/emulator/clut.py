@@ -1,36 +1,130 @@
 # -*- coding: utf-8 -*-
-# Copyright (c) 2017-2020 Richard Hull and contributors
+# Copyright (c) 2017-2026 Richard Hull and contributors
 # See LICENSE.rst for details.
 
 # From a comment by @TerrorBite on https://gist.github.com/MicahElliott/719710
 
+from functools import lru_cache
+
+from PIL import Image, ImageChops
+
 # Default color levels for the color cube
 cubelevels = [0x00, 0x5f, 0x87, 0xaf, 0xd7, 0xff]
 
 # Generate a list of midpoints of the above list
 snaps = [(x + y) / 2 for x, y in list(zip(cubelevels, [0] + cubelevels))[1:]]
 
+# Levels for the greyscale ramp (232-255)
+greylevels = [8 + 10 * i for i in range(24)]
+
+# The system colors (0-15), as rendered by xterm by default. Many terminals
+# allow these to be reconfigured, hence they are not matched against unless
+# explicitly requested.
+systemcolors = [
+    (0x00, 0x00, 0x00), (0xcd, 0x00, 0x00), (0x00, 0xcd, 0x00), (0xcd, 0xcd, 0x00),
+    (0x00, 0x00, 0xee), (0xcd, 0x00, 0xcd), (0x00, 0xcd, 0xcd), (0xe5, 0xe5, 0xe5),
+    (0x7f, 0x7f, 0x7f), (0xff, 0x00, 0x00), (0x00, 0xff, 0x00), (0xff, 0xff, 0x00),
+    (0x5c, 0x5c, 0xff), (0xff, 0x00, 0xff), (0x00, 0xff, 0xff), (0xff, 0xff, 0xff)
+]
+
+# Using list of snap points, precompute the cube index for every channel value
+_cube_index = [len(tuple(s for s in snaps if s < x)) for x in range(256)]
+
+# Per-band lookup table for Image.point, giving each channel's contribution
+# to the xterm-256 color, such that they just need summing
+_cube_lut = [i * 36 + 16 for i in _cube_index] + \
+    [i * 6 for i in _cube_index] + \
+    _cube_index
+
 
 def rgb2short(r, g, b):
     """
     Converts RGB values to the nearest equivalent xterm-256 color.
     """
-    # Using list of snap points, convert RGB value to cube indexes
-    r, g, b = [len(tuple(s for s in snaps if s < x)) for x in (r, g, b)]
-
     # Simple colorcube transform
-    return (r * 36) + (g * 6) + b + 16
+    return (_cube_index[r] * 36) + (_cube_index[g] * 6) + _cube_index[b] + 16
+
+
+def image2short(image):
+    """
+    Converts every pixel of an image to the nearest equivalent xterm-256
+    color, in a single pass.
+
+    :param image: The image to convert.
+    :type image: PIL.Image.Image
+    :returns: The xterm-256 color of each pixel, in row order.
+    :rtype: bytes
+
+    .. versionadded:: 1.8.0
+    """
+    r, g, b = image.convert("RGB").point(_cube_lut).split()
+    return ImageChops.add(ImageChops.add(r, g), b).tobytes()
+
 
+# Moves each channel value to the middle of its 8-value wide bucket
+_bucket_lut = [(x & 0xF8) | 4 for x in range(256)] * 3
 
-class __memoize:
-    def __init__(self, f):
-        self.f = f
-        self.memo = {}
 
-    def __call__(self, *args):
-        if args not in self.memo:
-            self.memo[args] = self.f(*args)
-        return self.memo[args]
+class palette(object):
+    """
+    Nearest-color matching against the whole of the xterm-256 palette,
+    rather than just the 6x6x6 color cube used by :func:`rgb2short`.
+
+    Matches are precomputed into a 32x32x32 lookup cube (i.e. using the top
+    5 bits of each channel), so that conversion is a single table lookup.
+
+    :param greyscale: Match against the greyscale ramp (232-255).
+    :type greyscale: bool
+    :param system_colors: Match against the 16 system colors (0-15).
+    :type system_colors: bool
+
+    .. versionadded:: 1.8.0
+    """
+    def __init__(self, greyscale=True, system_colors=False):
+        # Colors which are excluded from the palette are replaced by black,
+        # and any matches remapped to the color cube's black afterwards
+        black = (0, 0, 0)
+        cube = [(r, g, b) for r in cubelevels for g in cubelevels for b in cubelevels]
+        colors = (systemcolors if system_colors else [black] * 16) + cube + \
+            ([(x, x, x) for x in greylevels] if greyscale else [black] * 24)
+
+        self._palette = Image.new("P", (1, 1))
+        self._palette.putpalette([c for rgb in colors for c in rgb])
+        self._remap = bytes(16 if colors[i] == black else i for i in range(256))
+
+        centres = Image.new("RGB", (32 * 32 * 32, 1))
+        centres.putdata([((i >> 7) & 0xF8 | 4, (i >> 2) & 0xF8 | 4, (i << 3) & 0xF8 | 4)
+                         for i in range(32 * 32 * 32)])
+        self._cube = self._quantize(centres)
 
+    def _quantize(self, image):
+        image = image.quantize(palette=self._palette, dither=Image.Dither.NONE)
+        return image.tobytes().translate(self._remap)
 
-rgb2short = __memoize(rgb2short)
+    def rgb2short(self, r, g, b):
+        """
+        Converts RGB values to the nearest equivalent xterm-256 color.
+        """
+        return self._cube[(r >> 3) << 10 | (g >> 3) << 5 | (b >> 3)]
+
+    def image2short(self, image):
+        """
+        Converts every pixel of an image to the nearest equivalent xterm-256
+        color, giving the same results as :func:`rgb2short`.
+
+        :param image: The image to convert.
+        :type image: PIL.Image.Image
+        :returns: The xterm-256 color of each pixel, in row order.
+        :rtype: bytes
+        """
+        return self._quantize(image.convert("RGB").point(_bucket_lut))
+
+
+@lru_cache(maxsize=None)
+def get_palette(greyscale=True, system_colors=False):
+    """
+    Returns a (shared) :class:`palette` for the given options.
+
+    .. versionadded:: 1.8.0
+    """
+    return palette(greyscale, system_colors)
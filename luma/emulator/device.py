@@ -4,7 +4,9 @@
 
 import os
 import sys
+import math
 import struct
+import subprocess
 
 try:
     import fcntl
@@ -15,42 +17,155 @@ except ImportError:
     # If running on windows, these package are not available!
     ASCII_AVAILABLE = False
 import atexit
+import hashlib
 import logging
+import re
 import string
+import threading
+import time
 import collections
-from io import StringIO
-from PIL import Image, ImageFont, ImageDraw
+from io import BytesIO, StringIO
+from functools import lru_cache, cached_property
+from PIL import Image, ImageChops, ImageFont, ImageDraw
 
 from luma.core.device import device
 from luma.core.interface.serial import noop
-from luma.emulator.render import transformer
-from luma.emulator.clut import rgb2short
+from luma.emulator.render import transformer, image_transformer
+from luma.emulator.gif import gifwriter, assemble
+from luma.emulator.framestore import framestore
+from luma.emulator.archive import archive_writer
+from luma.emulator.writer import background_writer
+from luma.emulator.clut import image2short, get_palette
+from luma.emulator.metrics import recorder, null_stage
 from luma.emulator.segment_mapper import regular
 
 
 logger = logging.getLogger(__name__)
 
-__all__ = ["capture", "gifanim", "pygame"]
+__all__ = ["capture", "gifanim", "animation", "pygame", "headless"]
+
+
+def _truecolor(color_mode):
+    """
+    Determines whether 24-bit color should be used, given a ``color_mode`` of
+    ``"256"``, ``"truecolor"`` or ``"auto"`` (which checks whether the
+    terminal advertises support through the ``COLORTERM`` environment
+    variable).
+    """
+    assert color_mode in ("256", "truecolor", "auto")
+    if color_mode == "auto":
+        return os.environ.get("COLORTERM", "").lower() in ("truecolor", "24bit")
+    return color_mode == "truecolor"
+
+
+@lru_cache(maxsize=16)
+def _grey_palette(alpha):
+    """
+    Returns a palette of 256 greys, dimmed by ``alpha`` exactly as blending
+    with black does.
+    """
+    ramp = Image.frombytes("L", (256, 1), bytes(range(256)))
+    if alpha < 1.0:
+        ramp = Image.blend(Image.new("L", ramp.size, "black"), ramp, alpha)
+    return [(v, v, v) for v in ramp.tobytes()]
+
+
+# PIL raw modes for decoding the pixels of an RGB surface, keyed by the
+# surface's bit depth and red, green & blue masks
+_RAWMODES = {
+    (24, (0xFF, 0xFF00, 0xFF0000)): "RGB",
+    (24, (0xFF0000, 0xFF00, 0xFF)): "BGR",
+    (32, (0xFF, 0xFF00, 0xFF0000)): "RGBX",
+    (32, (0xFF0000, 0xFF00, 0xFF)): "BGRX"
+}
 
 
 class emulator(device):
     """
     Base class for emulated display driver classes
+
+    :mod:`pygame` is only imported (and the sprites used by some transforms
+    only loaded) when first needed.
+
+    Transforms are normally performed on pygame surfaces. Devices which
+    output images, rather than surfaces, may instead be created with a
+    ``backend`` of ``"pil"``, to transform the images directly (see
+    :class:`luma.emulator.render.image_transformer`) so that pygame is not
+    needed at all.
+
+    .. versionchanged:: 1.8.0
+       Added :func:`instrument` and ``backend``, and import pygame lazily.
     """
-    def __init__(self, width, height, rotate, mode, transform, scale):
+    def __init__(self, width, height, rotate, mode, transform, scale, backend="pygame"):
         super(emulator, self).__init__(serial_interface=noop())
-        try:
-            import pygame
-        except ImportError:
-            raise RuntimeError("Emulator requires pygame to be installed")
-        self._pygame = pygame
-        self.capabilities(width, height, rotate, mode)
+        assert backend in ("pygame", "pil")
+        self._backend = backend
         self.scale = 1 if transform == "none" else scale
-        self._transform = getattr(transformer(pygame, width, height, scale),
-                                  "none" if scale == 1 else transform)
+        self._transform_name = "none" if scale == 1 else transform
+        if self._transform_name != "none" and backend == "pygame":
+            # Fail early if the transform can't be performed
+            self._pygame
+        self.capabilities(width, height, rotate, mode)
         self._contrast = 1.0
         self._last_image = None
         self.segment_mapper = regular
+        self.metrics = None
+        self._black = None
+
+    @cached_property
+    def _pygame(self):
+        """
+        The :mod:`pygame` module, which is only imported when first needed:
+        devices which produce images (rather than surfaces), and do not
+        transform them, never require it.
+        """
+        try:
+            import pygame
+        except ImportError:
+            raise RuntimeError("Emulator requires pygame to be installed")
+        return pygame
+
+    @cached_property
+    def _transform(self):
+        return getattr(transformer(self._pygame, self._w, self._h, self.scale),
+                       self._transform_name)
+
+    @cached_property
+    def _image_transform(self):
+        return getattr(image_transformer(self._w, self._h, self.scale),
+                       self._transform_name)
+
+    def instrument(self, interval=None, filename=None):
+        """
+        Starts recording how long each stage of rendering a frame takes, such
+        as ``preprocess``, ``convert``, ``frombuffer`` and ``transform`` (the
+        steps of :func:`to_surface`), and the device-specific output stages.
+
+        :param interval: If given, report the timings every ``interval``
+            seconds to the log.
+        :type interval: float
+        :param filename: If given, also write the timings to this file as JSON
+            when reporting.
+        :type filename: str
+        :returns: The recorder, from which the timings can be retrieved with
+            ``snapshot()``.
+        :rtype: luma.emulator.metrics.recorder
+
+        .. versionadded:: 1.8.0
+        """
+        self.metrics = recorder(interval, filename)
+        return self.metrics
+
+    def _stage(self, name, nbytes=0):
+        """
+        Returns a context manager which times its body as stage ``name``, if
+        instrumentation is enabled.
+        """
+        return null_stage if self.metrics is None else self.metrics.stage(name, nbytes)
+
+    def preprocess(self, image):
+        with self._stage("preprocess"):
+            return super(emulator, self).preprocess(image)
 
     def show(self):
         self.contrast(0xFF)
@@ -60,6 +175,9 @@ class emulator(device):
 
     def contrast(self, value):
         assert 0 <= value <= 255
+        if value / 255.0 == self._contrast:
+            return
+
         self._contrast = value / 255.0
         if self._last_image is not None:
             self.display(self._last_image)
@@ -67,27 +185,107 @@ class emulator(device):
     def cleanup(self):
         pass
 
-    def to_surface(self, image, alpha=1.0):
+    def _blend(self, image, alpha):
+        """
+        Dims ``image`` towards black by ``alpha``, returning an ``L`` image
+        for monochrome or greyscale images, otherwise RGB.
+        """
+        assert 0.0 <= alpha <= 1.0
+        mode = "L" if image.mode in ("1", "L") else "RGB"
+        im = image.convert(mode)
+        if alpha == 1.0:
+            return im
+
+        black = self._black
+        if black is None or black.mode != mode or black.size != im.size:
+            black = self._black = Image.new(mode, im.size, "black")
+        return Image.blend(black, im, alpha)
+
+    def to_surface(self, image, alpha=1.0, reuse=False):
         """
         Converts a :py:mod:`PIL.Image` into a :class:`pygame.Surface`,
         transforming it according to the ``transform`` and ``scale``
         constructor arguments.
+
+        If ``reuse`` is set, the returned surface may be overwritten by the
+        next call, so must not be retained.
+
+        Monochrome and greyscale images are rendered to an 8-bit palettized
+        surface (unless the transform needs true color), with the contrast
+        applied to the palette rather than the pixels.
+
+        .. versionchanged:: 1.8.0
+           Added ``reuse`` parameter, and palettized surfaces.
         """
         assert 0.0 <= alpha <= 1.0
-        if alpha < 1.0:
-            im = image.convert("RGBA")
-            black = Image.new(im.mode, im.size, "black")
-            im = Image.blend(black, im, alpha)
+        if self._backend == "pil":
+            im = self.to_image(image, alpha).convert("RGB")
+            with self._stage("frombuffer", len(im.mode) * im.width * im.height):
+                return self._pygame.image.frombuffer(im.tobytes(), im.size, "RGB")
+
+        if image.mode in ("1", "L") and self._transform_name != "smoothscale":
+            with self._stage("convert") as stage:
+                data = image.convert("L").tobytes()
+                stage.nbytes = len(data)
+
+            with self._stage("frombuffer", len(data)):
+                surface = self._pygame.image.frombuffer(data, image.size, "P")
+                surface.set_palette(_grey_palette(alpha))
         else:
-            im = image.convert("RGB")
+            with self._stage("convert") as stage:
+                im = self._blend(image, alpha).convert("RGB")
+                data = im.tobytes()
+                stage.nbytes = len(data)
+                del im
 
-        mode = im.mode
-        size = im.size
-        data = im.tobytes()
-        del im
+            # The surface wraps (and keeps alive) the bytes, rather than copying them
+            with self._stage("frombuffer", len(data)):
+                surface = self._pygame.image.frombuffer(data, image.size, "RGB")
 
-        surface = self._pygame.image.fromstring(data, size, mode)
-        return self._transform(surface)
+        with self._stage("transform"):
+            return self._transform(surface, reuse=reuse)
+
+    def to_image(self, image, alpha=1.0):
+        """
+        Transforms a :py:mod:`PIL.Image` in the same way as :func:`to_surface`,
+        but returns the result as a :py:mod:`PIL.Image`, for devices which
+        output images rather than surfaces. If there is no transform to
+        apply, or the ``"pil"`` backend is used, pygame is bypassed
+        altogether.
+
+        The result is an ``L`` image if ``image`` is monochrome or greyscale
+        (and the transform does not introduce color), otherwise RGB.
+
+        .. versionadded:: 1.8.0
+        """
+        if self._transform_name == "none":
+            with self._stage("convert"):
+                return self._blend(image, alpha)
+
+        if self._backend == "pil":
+            with self._stage("convert"):
+                im = self._blend(image, alpha)
+            with self._stage("transform"):
+                return self._image_transform(im)
+
+        surface = self.to_surface(image, alpha, reuse=True)
+        with self._stage("tostring") as stage:
+            stage.nbytes = surface.get_pitch() * surface.get_height()
+            if surface.get_bitsize() == 8:
+                # Palettized greys: the pixels are the grey levels before
+                # dimming, so apply the contrast to those directly
+                im = Image.frombytes("L", surface.get_size(), surface.get_buffer(),
+                                     "raw", "L", surface.get_pitch(), 1)
+                return self._blend(im, alpha)
+
+            rawmode = _RAWMODES.get((surface.get_bitsize(), surface.get_masks()[:3]))
+            if rawmode is None:
+                rawbytes = self._pygame.image.tostring(surface, "RGB", False)
+                return Image.frombytes("RGB", surface.get_size(), rawbytes)
+
+            # Decode straight from the surface's pixels, rather than via a copy
+            return Image.frombytes("RGB", surface.get_size(), surface.get_buffer(),
+                                   "raw", rawmode, surface.get_pitch(), 1)
 
 
 class capture(emulator):
@@ -95,13 +293,78 @@ class capture(emulator):
     Pseudo-device that acts like a physical display, except that it writes the
     image to a numbered PNG file when the :func:`display` method is called.
     Supports 24-bit color depth.
+
+    By default, each PNG is encoded and written before :func:`display`
+    returns. If ``workers`` is greater than zero, frames are instead placed on
+    a queue (holding at most ``queue_size`` frames) and written by that many
+    background threads, so the caller's frame rate is not limited by PNG
+    compression or disk speed. ``overflow`` determines what happens when the
+    queue is full: ``"block"`` waits for space, while ``"drop_oldest"`` and
+    ``"drop_newest"`` discard a frame, which is logged and counted by
+    :py:attr:`dropped`. Outstanding frames are written out when
+    :func:`cleanup` is called.
+
+    If ``archive`` is given, the PNGs are instead appended to that single
+    file (a zip, tar or indexed ``.frames`` file, by its extension), named
+    by ``file_template`` within it, which saves creating a file per frame.
+    It is completed when :func:`cleanup` is called, and its frames can be
+    read back by number with :py:class:`luma.emulator.archive.archive_reader`.
+
+    .. versionchanged:: 1.8.0
+       Added ``workers``, ``queue_size``, ``overflow``, ``archive`` and
+       ``backend`` parameters.
     """
     def __init__(self, width=128, height=64, rotate=0, mode="RGB",
                  transform="scale2x", scale=2, file_template="luma_{0:06}.png",
-                 **kwargs):
-        super(capture, self).__init__(width, height, rotate, mode, transform, scale)
+                 workers=0, queue_size=16, overflow="block", archive=None,
+                 backend="pygame", **kwargs):
+        super(capture, self).__init__(width, height, rotate, mode, transform, scale, backend)
+        if backend == "pygame":
+            # Always needed, to write the PNGs
+            self._pygame
         self._count = 0
         self._file_template = file_template
+        self._archive = None if archive is None else archive_writer(archive)
+        self._writer = None
+        self._dropped = 0
+        if workers > 0:
+            self._writer = background_writer(self._save, workers=workers,
+                                             maxsize=queue_size, overflow=overflow,
+                                             on_drop=self._drop)
+
+    def _save(self, frame, number):
+        filename = self._file_template.format(number)
+        logger.debug(f"Writing: {filename}")
+        with self._stage("save") as stage:
+            # Encode into memory first when appending to an archive
+            fp = filename if self._archive is None else BytesIO()
+            if self._backend == "pil":
+                # Always write RGB PNGs, even for monochrome displays
+                frame.convert("RGB").save(fp, "PNG")
+            else:
+                surface = frame
+                if surface.get_bitsize() == 8:
+                    # Always write RGB PNGs, even for monochrome displays
+                    rgb = self._pygame.Surface(surface.get_size(), 0, 24)
+                    rgb.blit(surface, (0, 0))
+                    surface = rgb
+                self._pygame.image.save(surface, fp, filename)
+
+            if self._archive is not None:
+                data = fp.getvalue()
+                self._archive.add(number, filename, data)
+                stage.nbytes = len(data)
+
+    def _drop(self, frame, number):
+        logger.debug(f"Dropped: {self._file_template.format(number)}")
+
+    @property
+    def dropped(self):
+        """
+        The number of frames discarded because the background writing queue
+        was full.
+        """
+        return self._dropped + (self._writer.dropped if self._writer is not None else 0)
 
     def display(self, image):
         """
@@ -111,11 +374,31 @@ class capture(emulator):
         self._last_image = image
 
         self._count += 1
-        filename = self._file_template.format(self._count)
         image = self.preprocess(image)
-        surface = self.to_surface(image, alpha=self._contrast)
-        logger.debug(f"Writing: {filename}")
-        self._pygame.image.save(surface, filename)
+        if self._backend == "pil":
+            frame = self.to_image(image, alpha=self._contrast)
+        else:
+            # Queued surfaces must not be overwritten by subsequent frames
+            frame = self.to_surface(image, alpha=self._contrast, reuse=self._writer is None)
+
+        if self._writer is None:
+            self._save(frame, self._count)
+        else:
+            self._writer.submit(frame, self._count)
+
+    def cleanup(self):
+        """
+        Waits for any frames queued for background writing to be saved, then
+        completes the archive (if any).
+        """
+        super(capture, self).cleanup()
+        if self._writer is not None:
+            self._writer.join()
+            self._dropped += self._writer.dropped
+            self._writer = None
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
 
 
 class gifanim(emulator):
@@ -124,17 +407,51 @@ class gifanim(emulator):
     the images when the :func:`display` method is called, and on exit,
     assembles them into an animated GIF image. Supports 24-bit color depth,
     albeit with an indexed color palette.
+
+    By default, every frame is held in memory until exit. If ``streaming`` is
+    set, each frame is instead palettized and encoded straight to ``filename``
+    as it arrives, so memory usage remains constant regardless of how long the
+    capture runs for (at the expense of a per-frame palette, rather than the
+    optimized palette produced otherwise).
+
+    In either mode, a frame identical to its predecessor is not stored again;
+    instead the previous frame is shown for longer.
+
+    Otherwise, frames are held compressed in a
+    :py:class:`luma.emulator.framestore.framestore`: once they take up more
+    than ``memory`` bytes, older frames are moved out to a temporary file. If
+    ``window`` is given, only the most recent ``window`` seconds of the
+    animation are kept, with older frames being discarded, so that the device
+    can be left recording indefinitely (whereas ``max_frames`` exits the
+    program once that many frames have been displayed).
+
+    Assembling a long animation on exit can take some time. If ``workers``
+    is greater than zero, it is instead spread over that many processes by
+    :py:func:`luma.emulator.gif.assemble`, with every frame sharing a single
+    palette computed from a sample of the frames.
+
+    .. versionchanged:: 1.8.0
+       Added ``streaming``, ``memory``, ``window``, ``workers`` and
+       ``backend`` parameters, and merging of duplicate frames.
     """
     def __init__(self, width=128, height=64, rotate=0, mode="RGB",
                  transform="scale2x", scale=2, filename="luma_anim.gif",
-                 duration=0.01, loop=0, max_frames=None, **kwargs):
-        super(gifanim, self).__init__(width, height, rotate, mode, transform, scale)
-        self._images = []
+                 duration=0.01, loop=0, max_frames=None, streaming=False,
+                 memory=None, window=None, workers=0, backend="pygame", **kwargs):
+        super(gifanim, self).__init__(width, height, rotate, mode, transform, scale, backend)
+        assert not (streaming and window), "window cannot be used when streaming"
+        assert not (streaming and workers), "workers cannot be used when streaming"
+        self._frames = framestore(memory=memory, window=None if window is None else int(window * 1000))
+        self._previous = None
         self._count = 0
         self._max_frames = max_frames
         self._filename = filename
         self._loop = loop
         self._duration = int(duration * 1000)
+        self._streaming = streaming
+        self._workers = workers
+        self._fp = None
+        self._writer = None
         atexit.register(self.write_animation)
 
     def display(self, image):
@@ -146,10 +463,19 @@ class gifanim(emulator):
         self._last_image = image
 
         image = self.preprocess(image)
-        surface = self.to_surface(image, alpha=self._contrast)
-        rawbytes = self._pygame.image.tostring(surface, "RGB", False)
-        im = Image.frombytes("RGB", surface.get_size(), rawbytes)
-        self._images.append(im)
+        im = self.to_image(image, alpha=self._contrast)
+
+        with self._stage("append"):
+            if self._streaming:
+                if self._writer is None:
+                    self._fp = open(self._filename, "w+b")
+                    self._writer = gifwriter(self._fp, loop=self._loop)
+                self._writer.write(im, self._duration)
+            elif self._previous is not None and ImageChops.difference(self._previous, im).getbbox() is None:
+                self._frames.extend(self._duration)
+            else:
+                self._frames.append(im, self._duration)
+                self._previous = im
 
         self._count += 1
         logger.debug(f"Recording frame: {self._count}")
@@ -158,13 +484,164 @@ class gifanim(emulator):
             sys.exit(0)
 
     def write_animation(self):
-        if len(self._images) > 0:
+        if self._writer is not None:
+            self._writer.close()
+            self._fp.close()
+            self._writer = None
+
+            file_size = os.stat(self._filename).st_size
+            logger.debug(f"Wrote {self._count} frames to file: {self._filename} ({file_size} bytes)")
+
+        if len(self._frames) > 0:
             logger.debug("Please wait... building animated GIF")
             with open(self._filename, "w+b") as fp:
-                self._images[0].save(fp, save_all=True, loop=self._loop,
-                                     duration=self._duration,
-                                     append_images=self._images[1:],
-                                     optimize=True, format="GIF")
+                if self._workers > 0:
+                    assemble(fp, self._frames, loop=self._loop, workers=self._workers)
+                else:
+                    images = (image for image, _ in self._frames)
+                    next(images).save(fp, save_all=True, loop=self._loop,
+                                      duration=self._frames.durations(),
+                                      append_images=images,
+                                      optimize=True, format="GIF")
+
+            file_size = os.stat(self._filename).st_size
+            logger.debug(f"Wrote {self._count} frames to file: {self._filename} ({file_size} bytes)")
+
+
+class animation(emulator):
+    """
+    Pseudo-device that acts like a physical display, except that it records
+    the images passed to :func:`display` as an animation or video, in one
+    of the following formats:
+
+    * ``"apng"`` - an animated PNG
+    * ``"webp"`` - an animated WebP image (lossless, unless ``lossless`` is
+      ``False``)
+    * ``"y4m"`` - a YUV4MPEG2 video stream of full-range 4:4:4 YCbCr frames,
+      as accepted by most video encoders
+    * ``"raw"`` - 24-bit RGB frames, one after another, with no header
+
+    Unless ``format`` is given, it is chosen by the extension of
+    ``filename``: ``.png``/``.apng``, ``.webp``, ``.y4m`` or ``.rgb``/``.raw``.
+    Unlike :py:class:`gifanim`, every format supports 24-bit color depth.
+
+    APNG and WebP animations are written when :func:`cleanup` is called
+    (which happens automatically on exit). Until then frames are held
+    compressed, in the same way (and with the same ``memory`` and ``window``
+    options) as :py:class:`gifanim`, and a frame identical to its predecessor
+    is not stored again; instead the previous frame is shown for longer.
+
+    y4m and raw frames are instead written as soon as they are displayed,
+    at a constant rate of one frame every ``duration`` seconds, so memory
+    usage remains constant regardless of how long the recording runs for.
+    If ``command`` is given, it is started as a subprocess and the frames
+    are written to its standard input rather than to ``filename``, e.g.
+    ``command=["ffmpeg", "-i", "-", "luma.mp4"]`` to encode a y4m stream
+    straight to a video.
+
+    .. versionadded:: 1.8.0
+    """
+    FORMATS = {
+        ".png": "apng",
+        ".apng": "apng",
+        ".webp": "webp",
+        ".y4m": "y4m",
+        ".rgb": "raw",
+        ".raw": "raw"
+    }
+
+    def __init__(self, width=128, height=64, rotate=0, mode="RGB",
+                 transform="scale2x", scale=2, filename="luma_anim.png",
+                 format=None, duration=0.01, loop=0, lossless=True, command=None,
+                 memory=None, window=None, backend="pygame", **kwargs):
+        super(animation, self).__init__(width, height, rotate, mode, transform, scale, backend)
+        if format is None:
+            format = "y4m" if command else self.FORMATS.get(os.path.splitext(filename)[1].lower())
+        assert format in ("apng", "webp", "y4m", "raw"), f"Unsupported animation format: {format}"
+        assert command is None or format in ("y4m", "raw"), "command requires y4m or raw frames"
+        assert window is None or format in ("apng", "webp"), "window requires apng or webp format"
+
+        self._filename = filename
+        self._format = format
+        self._duration = int(duration * 1000)
+        self._loop = loop
+        self._lossless = lossless
+        self._command = command
+        self._frames = framestore(memory=memory, window=None if window is None else int(window * 1000))
+        self._previous = None
+        self._process = None
+        self._fp = None
+        self._count = 0
+
+    def display(self, image):
+        """
+        Takes an image, scales it according to the nominated transform, and
+        either writes it straight out, or stores it for later building into
+        an animation.
+        """
+        assert image.size == self.size
+        self._last_image = image
+
+        image = self.preprocess(image)
+        im = self.to_image(image, alpha=self._contrast)
+        self._count += 1
+
+        if self._format in ("apng", "webp"):
+            with self._stage("append"):
+                if self._previous is not None and ImageChops.difference(self._previous, im).getbbox() is None:
+                    self._frames.extend(self._duration)
+                else:
+                    self._frames.append(im, self._duration)
+                    self._previous = im
+            return
+
+        with self._stage("write") as stage:
+            if self._fp is None:
+                self._open(im.size)
+
+            if self._format == "y4m":
+                data = b"FRAME\n" + b"".join(band.tobytes() for band in im.convert("YCbCr").split())
+            else:
+                data = im.convert("RGB").tobytes()
+            self._fp.write(data)
+            stage.nbytes = len(data)
+
+    def _open(self, size):
+        if self._command is not None:
+            self._process = subprocess.Popen(self._command, stdin=subprocess.PIPE)
+            self._fp = self._process.stdin
+        else:
+            self._fp = open(self._filename, "wb")
+
+        if self._format == "y4m":
+            divisor = math.gcd(1000, self._duration)
+            header = f"YUV4MPEG2 W{size[0]} H{size[1]} F{1000 // divisor}:{self._duration // divisor} " \
+                     "Ip A1:1 C444 XCOLORRANGE=FULL\n"
+            self._fp.write(header.encode("ascii"))
+
+    def cleanup(self):
+        """
+        Writes out the animation, or closes the video stream.
+        """
+        super(animation, self).cleanup()
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+            if self._process is not None:
+                self._process.wait()
+                self._process = None
+            logger.debug(f"Wrote {self._count} frames to: {self._command or self._filename}")
+
+        if len(self._frames) > 0:
+            logger.debug(f"Please wait... building {self._format} animation")
+            params = {"lossless": self._lossless} if self._format == "webp" else {}
+            first, _ = self._frames[0]
+            with open(self._filename, "w+b") as fp:
+                first.save(fp, save_all=True, loop=self._loop,
+                           duration=self._frames.durations(),
+                           append_images=self._frames.images(1),
+                           format="PNG" if self._format == "apng" else "WEBP", **params)
+            self._frames.clear()
 
             file_size = os.stat(self._filename).st_size
             logger.debug(f"Wrote {self._count} frames to file: {self._filename} ({file_size} bytes)")
@@ -180,9 +657,25 @@ class pygame(emulator):
     :mod:`pygame` is used to render the emulated display window, and it's
     event loop is checked to see if the ESC key was pressed or the window
     was dismissed: if so :func:`sys.exit()` is called.
+
+    Only the area of the window covering pixels that changed since the
+    previous frame is redrawn, unless the transform (``smoothscale`` or
+    ``seven_segment``) depends on the whole frame.
+
+    Normally :func:`display` blocks as necessary to limit the frame rate. If
+    ``threaded`` is set, it returns immediately instead: only the most recent
+    frame is kept, and a dedicated thread presents it at the given frame
+    rate, dropping any frame that is superseded before it can be shown. (As
+    the window is then driven from that thread, this mode may not work on
+    platforms which require it to be on the main thread, such as macOS.)
+    Either way, :func:`stats` reports whether the application is keeping up.
+
+    .. versionchanged:: 1.8.0
+       Redraw only the changed region of the display, and added ``threaded``
+       parameter and :func:`stats`.
     """
     def __init__(self, width=128, height=64, rotate=0, mode="RGB", transform="scale2x",
-                 scale=2, frame_rate=60, **kwargs):
+                 scale=2, frame_rate=60, threaded=False, **kwargs):
         super(pygame, self).__init__(width, height, rotate, mode, transform, scale)
         self._pygame.display.init()
         self._pygame.font.init()
@@ -190,36 +683,356 @@ class pygame(emulator):
         self._clock = self._pygame.time.Clock()
         self._fps = frame_rate
         self._screen = None
+        self._last_frame = None
+        self._last_alpha = None
+
+        self._submitted = 0
+        self._presented = 0
+        self._dropped = 0
+        self._latencies = collections.deque(maxlen=1000)
+
+        self._thread = None
+        self._aborted = False
+        if threaded:
+            self._pending = None
+            self._running = True
+            self._lock = threading.Lock()
+            self._thread = threading.Thread(target=self._render_loop, daemon=True)
+            self._thread.start()
 
     def _abort(self):
         keystate = self._pygame.key.get_pressed()
         return keystate[self._pygame.K_ESCAPE] or self._pygame.event.peek(self._pygame.QUIT)
 
+    def _poll(self):
+        """
+        Waits until the next frame is due, then checks whether the window has
+        been dismissed.
+        """
+        self._clock.tick(self._fps)
+        self._pygame.event.pump()
+        if self._abort():
+            self._pygame.quit()
+            self._aborted = True
+        return self._aborted
+
+    def _dirty_region(self, image):
+        """
+        Returns the bounding box of pixels in ``image`` which differ from the
+        previously rendered frame (an empty tuple if there are none), or
+        ``None`` if the whole frame must be redrawn.
+        """
+        if self._screen is None or self._last_alpha != self._contrast or \
+                self._transform_name not in transformer.local:
+            return None
+
+        return ImageChops.difference(self._last_frame, image).getbbox() or ()
+
     def display(self, image):
         """
         Takes a :py:mod:`PIL.Image` and renders it to a pygame display surface.
         """
         assert image.size == self.size
         self._last_image = image
+        submitted_at = time.perf_counter()
 
-        image = self.preprocess(image)
-        self._clock.tick(self._fps)
-        self._pygame.event.pump()
+        if self._thread is not None and self._aborted:
+            sys.exit()
 
-        if self._abort():
-            self._pygame.quit()
+        # Snapshot the frame, in case the caller reuses the image: the next
+        # frame is compared against it to find the region to redraw
+        image = self.preprocess(image).copy()
+
+        if self._thread is not None:
+            with self._lock:
+                self._submitted += 1
+                if self._pending is not None:
+                    self._dropped += 1
+                self._pending = (image, self._contrast, submitted_at)
+            return
+
+        self._submitted += 1
+        if self._poll():
             sys.exit()
 
-        surface = self.to_surface(image, alpha=self._contrast)
-        if self._screen is None:
-            self._screen = self._pygame.display.set_mode(surface.get_size())
-        self._screen.blit(surface, (0, 0))
-        self._pygame.display.flip()
+        self._present(image, self._contrast, submitted_at)
+
+    def _render_loop(self):
+        while self._running and not self._poll():
+            self._present_pending()
+        self._present_pending()
+
+    def _present_pending(self):
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if pending is not None and not self._aborted:
+            self._present(*pending)
+
+    def _present(self, image, alpha, submitted_at):
+        with self._stage("present"):
+            self._redraw(image, alpha)
+
+        self._presented += 1
+        self._latencies.append(time.perf_counter() - submitted_at)
+
+    def _redraw(self, image, alpha):
+        bbox = self._dirty_region(image)
+        self._last_frame = image
+        self._last_alpha = alpha
+
+        if bbox is None:
+            surface = self.to_surface(image, alpha=alpha, reuse=True)
+            if self._screen is None:
+                self._screen = self._pygame.display.set_mode(surface.get_size())
+            self._screen.blit(surface, (0, 0))
+            self._pygame.display.flip()
+
+        elif bbox:
+            # A changed pixel can affect the transformed output of its
+            # neighbours, so redraw one pixel beyond the changes, and transform
+            # a crop with a further pixel margin to stand in for the rest of
+            # the frame. Only the redrawn part of the crop is copied into place
+            w, h = image.size
+            grow = lambda box: (max(0, box[0] - 1), max(0, box[1] - 1),
+                                min(w, box[2] + 1), min(h, box[3] + 1))
+            left, top, right, bottom = grow(bbox)
+            margin = grow((left, top, right, bottom))
+            surface = self.to_surface(image.crop(margin), alpha=alpha, reuse=True)
+
+            factor = self._screen.get_width() // image.width
+            dest = self._pygame.Rect(left * factor, top * factor,
+                                     (right - left) * factor, (bottom - top) * factor)
+            area = dest.move(-margin[0] * factor, -margin[1] * factor)
+            self._screen.blit(surface, dest, area=area)
+            self._pygame.display.update(dest)
+
+    def stats(self):
+        """
+        Reports how many frames have been submitted to :func:`display`, how
+        many were presented, and how many were dropped in favor of a newer
+        frame. Present latency (the time from :func:`display` being called to
+        the frame being shown, in seconds) is summarized over the most recent
+        1000 frames.
+
+        :rtype: dict
+
+        .. versionadded:: 1.8.0
+        """
+        latencies = sorted(self._latencies)
+        percentile = lambda p: latencies[min(len(latencies) - 1, int(p / 100.0 * len(latencies)))] \
+            if latencies else None
+
+        return {
+            "submitted": self._submitted,
+            "presented": self._presented,
+            "dropped": self._dropped,
+            "latency": {
+                "mean": sum(latencies) / len(latencies) if latencies else None,
+                "p50": percentile(50),
+                "p95": percentile(95),
+                "p99": percentile(99),
+                "max": latencies[-1] if latencies else None
+            }
+        }
+
+    def cleanup(self):
+        """
+        Stops the render thread (if any), once the latest frame is presented.
+        """
+        super(pygame, self).cleanup()
+        if self._thread is not None:
+            self._running = False
+            self._thread.join()
+            self._thread = None
+
+
+class headless(emulator):
+    """
+    Pseudo-device that acts like a physical display, except that it retains
+    the most recent ``frames`` images passed to :func:`display` (after being
+    transformed) in memory, without any file, window or terminal output. This
+    makes it suitable for rendering large numbers of frames in automated
+    tests.
+
+    Frames are stored in a ring buffer, allocated when the first frame is
+    displayed, with the oldest frame being overwritten once it is full.
+    Frames may then be retrieved, compared and hashed by index: ``0`` is the
+    oldest frame held, and ``-1`` the most recent.
+
+    Frames are stored as ``L`` images for monochrome displays (where the
+    transform allows), or else RGB.
+
+    .. versionadded:: 1.8.0
+    """
+    def __init__(self, width=128, height=64, rotate=0, mode="RGB", transform="scale2x",
+                 scale=2, frames=16, backend="pygame", **kwargs):
+        super(headless, self).__init__(width, height, rotate, mode, transform, scale, backend)
+        assert frames >= 1
+        self._capacity = frames
+        self._buffer = None
+        self._frame_mode = None
+        self._frame_size = None
+        self._frame_bytes = 0
+        self._count = 0
+
+    def display(self, image):
+        """
+        Takes a :py:mod:`PIL.Image`, transforms it and stores it as the most
+        recent frame.
+        """
+        assert image.size == self.size
+        self._last_image = image
+
+        im = self.to_image(self.preprocess(image), alpha=self._contrast)
+        with self._stage("store") as stage:
+            if self._buffer is None:
+                self._frame_mode = im.mode
+                self._frame_size = im.size
+                self._frame_bytes = len(im.mode) * im.width * im.height
+                self._buffer = memoryview(bytearray(self._capacity * self._frame_bytes))
+
+            assert im.mode == self._frame_mode and im.size == self._frame_size
+            offset = (self._count % self._capacity) * self._frame_bytes
+            self._buffer[offset:offset + self._frame_bytes] = im.tobytes()
+            stage.nbytes = self._frame_bytes
+            self._count += 1
+
+    @property
+    def count(self):
+        """
+        The total number of frames displayed (including any which have since
+        been discarded).
+        """
+        return self._count
+
+    def __len__(self):
+        return min(self._count, self._capacity)
+
+    def _frame_bytes_at(self, index):
+        """
+        Returns a view of the stored bytes of the frame at ``index``.
+        """
+        held = len(self)
+        if not -held <= index < held:
+            raise IndexError(f"Frame index {index} out of range: {held} frames held")
+
+        slot = (self._count - held + index % held) % self._capacity
+        offset = slot * self._frame_bytes
+        return self._buffer[offset:offset + self._frame_bytes]
+
+    def frame(self, index=-1):
+        """
+        Returns a copy of a stored frame.
+
+        :param index: The frame to return (0 = the oldest held, -1 = the most
+            recent).
+        :type index: int
+        :rtype: PIL.Image.Image
+        """
+        return Image.frombytes(self._frame_mode, self._frame_size, self._frame_bytes_at(index))
+
+    def frames(self):
+        """
+        Returns copies of all the stored frames, oldest first.
+
+        :rtype: list
+        """
+        return [self.frame(i) for i in range(len(self))]
+
+    def digest(self, index=-1, algorithm="sha1"):
+        """
+        Computes a hash of the pixels of a stored frame, without copying it.
+
+        :param index: The frame to hash.
+        :type index: int
+        :param algorithm: Any algorithm supported by :py:func:`hashlib.new`.
+        :type algorithm: str
+        :returns: The hex digest.
+        :rtype: str
+        """
+        return hashlib.new(algorithm, self._frame_bytes_at(index)).hexdigest()
+
+    def compare(self, reference, index=-1):
+        """
+        Compares a stored frame against a reference image.
+
+        :param reference: The expected image, of the same size as the stored
+            (transformed) frames.
+        :type reference: PIL.Image.Image
+        :param index: The frame to compare.
+        :type index: int
+        :returns: The bounding box of the pixels which differ, or ``None`` if
+            the frame is identical to ``reference``.
+        :rtype: tuple
+        """
+        data = self._frame_bytes_at(index)
+        if reference.size != self._frame_size:
+            return (0, 0) + self._frame_size
+
+        reference = reference.convert(self._frame_mode)
+        if reference.tobytes() == data:
+            return None
+        return ImageChops.difference(self.frame(index), reference).getbbox()
+
+    def reset(self):
+        """
+        Discards all stored frames.
+        """
+        self._count = 0
 
 
 if ASCII_AVAILABLE:
     __all__.extend(["asciiart", "asciiblock"])
 
+    # SGR parameters for each xterm-256 foreground & background color
+    _FG_256 = [f'38;5;{i}' for i in range(256)]
+    _BG_256 = [f'48;5;{i}' for i in range(256)]
+
+    _default_font = lru_cache(maxsize=None)(ImageFont.load_default)
+
+    @lru_cache(maxsize=None)
+    def _char_ramp(font):
+        """
+        Sorts printable characters according to the number of black pixels
+        present when rendered in ``font``, returning them along with the size
+        of a character cell. This is computed just once per font.
+        """
+        def density(c):
+            image = Image.new('1', font.getbbox(c)[2:], color=255)
+            draw = ImageDraw.Draw(image)
+            draw.text((0, 0), c, fill="white", font=font)
+            return image.histogram()[0]  # 0 is black
+
+        # Don't use string.printable, since we don't want any whitespace except spaces.
+        charset = (string.ascii_letters + string.digits + string.punctuation + "  ")
+        return tuple(reversed(sorted(charset, key=density))), tuple(font.getbbox("X")[2:])
+
+    @lru_cache(maxsize=None)
+    def _grey_ramp(chars):
+        """
+        Returns a translation table, mapping each greyscale level (0-255) onto
+        a character from ``chars``.
+        """
+        return bytes(ord(chars[int(greyscale / 255. * (len(chars) - 1) + 0.5)]) for greyscale in range(256))
+
+    # Matches runs of the same byte
+    _RUNS = re.compile(rb'(.)\1*', re.DOTALL)
+
+    _color_pairs_initialized = False
+
+    def _init_color_pairs():
+        """
+        Sets up a curses color pair for every terminal color, the first time
+        a device is created.
+        """
+        global _color_pairs_initialized
+        curses.start_color()
+        curses.use_default_colors()
+        if not _color_pairs_initialized:
+            for i in range(0, curses.COLORS):
+                curses.init_pair(i, i, -1)
+            _color_pairs_initialized = True
+
     class asciiart(emulator):
         """
         Pseudo-device that acts like a physical display, except that it converts the
@@ -232,17 +1045,33 @@ if ASCII_AVAILABLE:
 
         Loosely based on https://github.com/ajalt/pyasciigen/blob/master/asciigen.py
 
+        Colors are matched against the 6x6x6 color cube, unless ``greyscale``
+        or ``system_colors`` are set, in which case the greyscale ramp and/or
+        16 system colors are considered too.
+
+        curses can only address the terminal's 256 color palette, so when
+        ``color_mode`` is ``"truecolor"`` (or ``"auto"`` and the terminal
+        supports 24-bit color) the greyscale ramp is always matched against,
+        giving the closest colors available.
+
+        Only the rows which have changed since the previous frame are redrawn.
+
         .. versionadded:: 0.2.0
+
+        .. versionchanged:: 1.8.0
+           Added ``greyscale``, ``system_colors``, ``color_mode`` and
+           ``backend`` parameters, and only redraw changed rows.
         """
         def __init__(self, width=128, height=64, rotate=0, mode="RGB", transform="scale2x",
-                     scale=2, **kwargs):
+                     scale=2, greyscale=False, system_colors=False, color_mode="256",
+                     backend="pygame", **kwargs):
 
-            super(asciiart, self).__init__(width, height, rotate, mode, transform, scale)
+            super(asciiart, self).__init__(width, height, rotate, mode, transform, scale, backend)
+            greyscale = greyscale or _truecolor(color_mode)
+            self._image2short = get_palette(greyscale, system_colors).image2short \
+                if greyscale or system_colors else image2short
             self._stdscr = curses.initscr()
-            curses.start_color()
-            curses.use_default_colors()
-            for i in range(0, curses.COLORS):
-                curses.init_pair(i, i, -1)
+            _init_color_pairs()
             curses.noecho()
             curses.cbreak()
 
@@ -251,34 +1080,26 @@ if ASCII_AVAILABLE:
             self._captured = (StringIO(), StringIO())
             sys.stdout, sys.stderr = self._captured
 
-            # Sort printable characters according to the number of black pixels present.
-            # Don't use string.printable, since we don't want any whitespace except spaces.
-            charset = (string.ascii_letters + string.digits + string.punctuation + "  ")
-            self._chars = list(reversed(sorted(charset, key=self._char_density)))
-            self._char_width, self._char_height = ImageFont.load_default().getbbox("X")[2:]
+            self._chars, (self._char_width, self._char_height) = _char_ramp(_default_font())
             self._contrast = 1.0
+            self._rows = None
 
-        def _char_density(self, c, font=ImageFont.load_default()):
+        def _render_art(self, image, width, height):
             """
-            Count the number of black pixels in a rendered character.
+            Returns the ascii art characters as a string, along with their
+            colors as bytes.
             """
-            image = Image.new('1', font.getbbox(c)[2:], color=255)
-            draw = ImageDraw.Draw(image)
-            draw.text((0, 0), c, fill="white", font=font)
-            return collections.Counter(image.getdata())[0]  # 0 is black
+            # Characters aren't square, so scale the output by the aspect ratio of a charater
+            height = int(height * self._char_width / float(self._char_height))
+            image = image.resize((width, height), Image.Resampling.LANCZOS).convert("RGB")
+            text = image.convert("L").tobytes().translate(_grey_ramp(self._chars))
+            return text.decode("ascii"), self._image2short(image)
 
         def _generate_art(self, image, width, height):
             """
             Return an iterator that produces the ascii art.
             """
-            # Characters aren't square, so scale the output by the aspect ratio of a charater
-            height = int(height * self._char_width / float(self._char_height))
-            image = image.resize((width, height), Image.Resampling.LANCZOS).convert("RGB")
-
-            for (r, g, b) in image.getdata():
-                greyscale = int(0.299 * r + 0.587 * g + 0.114 * b)
-                ch = self._chars[int(greyscale / 255. * (len(self._chars) - 1) + 0.5)]
-                yield (ch, rgb2short(r, g, b))
+            return zip(*self._render_art(image, width, height))
 
         def display(self, image):
             """
@@ -288,24 +1109,41 @@ if ASCII_AVAILABLE:
             assert image.size == self.size
             self._last_image = image
 
-            surface = self.to_surface(self.preprocess(image), alpha=self._contrast)
-            rawbytes = self._pygame.image.tostring(surface, "RGB", False)
-            image = Image.frombytes("RGB", surface.get_size(), rawbytes)
+            image = self.to_image(self.preprocess(image), alpha=self._contrast)
 
-            scr_width = self._stdscr.getmaxyx()[1]
+            scr_height, scr_width = self._stdscr.getmaxyx()
             scale = float(scr_width) / image.width
-
-            self._stdscr.erase()
-            self._stdscr.move(0, 0)
-            try:
-                for (ch, color) in self._generate_art(image, int(image.width * scale), int(image.height * scale)):
-                    self._stdscr.addstr(ch, curses.color_pair(color))
-
-            except curses.error:
-                # End of screen reached
-                pass
-
-            self._stdscr.refresh()
+            width = int(image.width * scale)
+
+            with self._stage("render"):
+                text, colors = self._render_art(image, width, int(image.height * scale))
+            rows = [(text[i:i + width], colors[i:i + width])
+                    for i in range(0, len(text), width)][:scr_height]
+
+            previous = self._rows
+            if previous is None or len(previous) != len(rows) or self._rows_width != width:
+                self._stdscr.erase()
+                previous = [None] * len(rows)
+            self._rows = rows
+            self._rows_width = width
+
+            # Only redraw rows which have changed, one run of color at a time
+            with self._stage("write") as stage:
+                for y, row in enumerate(rows):
+                    if row == previous[y]:
+                        continue
+
+                    text, colors = row
+                    stage.nbytes += len(text)
+                    for run in _RUNS.finditer(colors):
+                        start, end = run.span()
+                        try:
+                            self._stdscr.addstr(y, start, text[start:end], curses.color_pair(colors[start]))
+                        except curses.error:
+                            # Writing to the bottom-right corner moves the cursor off-screen
+                            pass
+
+                self._stdscr.refresh()
 
         def cleanup(self):
             super(asciiart, self).cleanup()
@@ -332,12 +1170,32 @@ if ASCII_AVAILABLE:
 
         Inspired by `Command Line Curiosities - Making the Terminal Sing by Hamza Haiken <https://www.youtube.com/watch?v=j5zA5Xi_ph8>`__
 
+        Colors are matched against the 6x6x6 color cube, unless ``greyscale``
+        or ``system_colors`` are set, in which case the greyscale ramp and/or
+        16 system colors are considered too.
+
+        If ``color_mode`` is ``"truecolor"``, pixels are output as 24-bit
+        colors without any quantization; ``"auto"`` does so only if the
+        ``COLORTERM`` environment variable indicates the terminal supports it.
+
+        Each frame is written to the terminal in one go, and only the cells
+        that changed since the previous frame are redrawn.
+
         .. versionadded:: 1.1.0
+
+        .. versionchanged:: 1.8.0
+           Added ``greyscale``, ``system_colors``, ``color_mode`` and
+           ``backend`` parameters, and only redraw changed cells.
         """
         def __init__(self, width=128, height=64, rotate=0, mode="RGB", transform="scale2x",
-                     scale=2, **kwargs):
-
-            super(asciiblock, self).__init__(width, height, rotate, mode, transform, scale)
+                     scale=2, greyscale=False, system_colors=False, color_mode="256",
+                     backend="pygame", **kwargs):
+
+            super(asciiblock, self).__init__(width, height, rotate, mode, transform, scale, backend)
+            self._truecolor = _truecolor(color_mode)
+            self._image2short = get_palette(greyscale, system_colors).image2short \
+                if greyscale or system_colors else image2short
+            self._cells = None
             self._CSI("2J")
 
         def _terminal_size(self):
@@ -347,17 +1205,26 @@ if ASCII_AVAILABLE:
 
         def _generate_art(self, image, width, height):
             """
-            Return an iterator that produces the ascii art.
+            Return an iterator that produces the ascii art, as pairs of
+            foreground and background SGR parameters.
             """
             image = image.resize((width, height), Image.LANCZOS).convert("RGB")
-            pixels = list(image.getdata())
 
+            if self._truecolor:
+                data = image.tobytes()
+                for y in range(0, height - 1, 2):
+                    for x in range(width):
+                        i = (y * width + x) * 3
+                        j = i + width * 3
+                        yield (f'38;2;{data[j]};{data[j + 1]};{data[j + 2]}',
+                               f'48;2;{data[i]};{data[i + 1]};{data[i + 2]}')
+                return
+
+            colors = self._image2short(image)
             for y in range(0, height - 1, 2):
                 for x in range(width):
                     i = y * width + x
-                    bg = rgb2short(*(pixels[i]))
-                    fg = rgb2short(*(pixels[i + width]))
-                    yield (fg, bg)
+                    yield (_FG_256[colors[i + width]], _BG_256[colors[i]])
 
         def _CSI(self, cmd):
             """
@@ -374,21 +1241,50 @@ if ASCII_AVAILABLE:
             assert image.size == self.size
             self._last_image = image
 
-            surface = self.to_surface(self.preprocess(image), alpha=self._contrast)
-            rawbytes = self._pygame.image.tostring(surface, "RGB", False)
-            image = Image.frombytes("RGB", surface.get_size(), rawbytes)
+            image = self.to_image(self.preprocess(image), alpha=self._contrast)
 
             scr_width = self._terminal_size()[1]
             scale = float(scr_width) / image.width
-
-            self._CSI('1;1H')  # Move to top/left
-
-            for (fg, bg) in self._generate_art(image, int(image.width * scale), int(image.height * scale)):
-                self._CSI(f'38;5;{fg};48;5;{bg}m')
-                sys.stdout.write('▄')
-
-            self._CSI('0m')
-            sys.stdout.flush()
+            width = int(image.width * scale)
+
+            with self._stage("render"):
+                cells = list(self._generate_art(image, width, int(image.height * scale)))
+                previous = self._cells
+                if previous is None or len(previous) != len(cells) or self._cells_width != width:
+                    previous = [None] * len(cells)
+                self._cells = cells
+                self._cells_width = width
+
+                out = []
+                fg = bg = None
+                for row in range(0, len(cells), width):
+                    if cells[row:row + width] == previous[row:row + width]:
+                        continue
+
+                    cursor = None
+                    for col in range(width):
+                        cell = cells[row + col]
+                        if cell == previous[row + col]:
+                            continue
+
+                        if cursor != col:
+                            out.append(f'\x1b[{row // width + 1};{col + 1}H')
+                        if cell[0] != fg and cell[1] != bg:
+                            out.append(f'\x1b[{cell[0]};{cell[1]}m')
+                        elif cell[0] != fg:
+                            out.append(f'\x1b[{cell[0]}m')
+                        elif cell[1] != bg:
+                            out.append(f'\x1b[{cell[1]}m')
+                        fg, bg = cell
+                        out.append('▄')
+                        cursor = col + 1
+
+            if out:
+                out.append('\x1b[0m')
+                data = ''.join(out)
+                with self._stage("write", len(data)):
+                    sys.stdout.write(data)
+                    sys.stdout.flush()
 
         def cleanup(self):
             super(asciiblock, self).cleanup()
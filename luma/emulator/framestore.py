@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 Richard Hull and contributors
+# See LICENSE.rst for details.
+
+import zlib
+import tempfile
+import itertools
+import collections
+
+from PIL import Image
+
+
+__all__ = ["framestore"]
+
+
+class _frame(object):
+    """
+    A compressed frame, held either in memory (``data``) or at ``offset`` in
+    the spill file.
+    """
+    __slots__ = ("mode", "size", "duration", "data", "offset", "length")
+
+    def __init__(self, mode, size, duration, data):
+        self.mode = mode
+        self.size = size
+        self.duration = duration
+        self.data = data
+        self.offset = None
+        self.length = len(data)
+
+
+class _images(object):
+    """
+    The images held in a :py:class:`framestore` from ``start`` onwards,
+    which (unlike a generator) can be iterated over more than once.
+    """
+    def __init__(self, store, start):
+        self._store = store
+        self._start = start
+
+    def __iter__(self):
+        for image, _ in itertools.islice(self._store, self._start, None):
+            yield image
+
+
+class framestore(object):
+    """
+    Holds a sequence of frames, along with how long each is shown for, with
+    every frame compressed (losslessly) as it is added, so that far more
+    frames fit in memory than would as :py:mod:`PIL.Image` instances.
+
+    Once the compressed frames held in memory exceed ``memory`` bytes, the
+    oldest are moved out to a temporary file, so memory usage stays bounded
+    however many frames are added.
+
+    If ``window`` is given, only the most recent frames are retained: older
+    frames are discarded as soon as those after them last for at least
+    ``window`` milliseconds.
+
+    :param memory: Maximum number of bytes of compressed frames to hold in
+        memory (``None`` = unlimited).
+    :type memory: int
+    :param window: Total duration of the frames to retain, in milliseconds
+        (``None`` = retain every frame).
+    :type window: int
+    :param level: zlib compression level, from 0 (none) to 9 (best).
+    :type level: int
+
+    .. versionadded:: 1.8.0
+    """
+    def __init__(self, memory=None, window=None, level=1):
+        assert memory is None or memory >= 0
+        assert window is None or window > 0
+        self._memory = memory
+        self._window = window
+        self._level = level
+        self._spilled = collections.deque()
+        self._held = collections.deque()
+        self._file = None
+        self._file_size = 0
+        self._spilled_size = 0
+        self.nbytes = 0
+        self.duration = 0
+
+    def __len__(self):
+        return len(self._spilled) + len(self._held)
+
+    def __getitem__(self, index):
+        """
+        Returns the frame at ``index`` (where ``0`` is the oldest frame, and
+        ``-1`` the most recent) as an ``(image, duration)`` pair.
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("frame index out of range")
+
+        spilled = len(self._spilled)
+        return self._decompress(self._spilled[index] if index < spilled else self._held[index - spilled])
+
+    def __iter__(self):
+        """
+        Yields each frame as an ``(image, duration)`` pair, oldest first.
+        """
+        for frame in itertools.chain(list(self._spilled), list(self._held)):
+            yield self._decompress(frame)
+
+    def _decompress(self, frame):
+        data = frame.data
+        if data is None:
+            self._file.seek(frame.offset)
+            data = self._file.read(frame.length)
+        return Image.frombytes(frame.mode, frame.size, zlib.decompress(data)), frame.duration
+
+    def durations(self):
+        """
+        :returns: How long each frame is shown for, oldest first, without
+            decompressing any of them.
+        :rtype: list
+        """
+        return [frame.duration for frame in itertools.chain(self._spilled, self._held)]
+
+    def images(self, start=0):
+        """
+        :returns: The images (without their durations) from ``start``
+            onwards, oldest first, in an iterable which may be iterated over
+            more than once, decompressing each image as it is reached.
+        """
+        return _images(self, start)
+
+    def append(self, image, duration):
+        """
+        Compresses ``image`` and adds it as the most recent frame.
+
+        :param image: The frame to add.
+        :type image: PIL.Image.Image
+        :param duration: How long the frame is shown for, in milliseconds.
+        :type duration: int
+        """
+        frame = _frame(image.mode, image.size, duration, zlib.compress(image.tobytes(), self._level))
+        self._held.append(frame)
+        self.nbytes += frame.length
+        self.duration += duration
+        self._evict()
+        self._spill()
+
+    def extend(self, duration):
+        """
+        Shows the most recent frame for ``duration`` milliseconds longer.
+        """
+        (self._held or self._spilled)[-1].duration += duration
+        self.duration += duration
+        self._evict()
+
+    def _evict(self):
+        if self._window is None:
+            return
+
+        while len(self) > 1:
+            frames = self._spilled or self._held
+            if self.duration - frames[0].duration < self._window:
+                break
+
+            frame = frames.popleft()
+            self.duration -= frame.duration
+            if frame.data is None:
+                self._spilled_size -= frame.length
+            else:
+                self.nbytes -= frame.length
+
+        if not self._spilled and self._file is not None:
+            self._file.close()
+            self._file = None
+            self._file_size = 0
+
+    def _spill(self):
+        if self._memory is None:
+            return
+
+        while self.nbytes > self._memory:
+            if self._file is None:
+                self._file = tempfile.TemporaryFile()
+            elif self._file_size > 2 * self._spilled_size + self._memory:
+                self._compact()
+
+            frame = self._held.popleft()
+            self._file.seek(self._file_size)
+            self._file.write(frame.data)
+            frame.offset = self._file_size
+            frame.data = None
+            self._file_size += frame.length
+            self._spilled_size += frame.length
+            self.nbytes -= frame.length
+            self._spilled.append(frame)
+
+    def _compact(self):
+        """
+        Copies the frames still retained into a new temporary file, so that
+        space used by evicted frames is reclaimed.
+        """
+        compacted = tempfile.TemporaryFile()
+        offset = 0
+        for frame in self._spilled:
+            self._file.seek(frame.offset)
+            compacted.write(self._file.read(frame.length))
+            frame.offset = offset
+            offset += frame.length
+
+        self._file.close()
+        self._file = compacted
+        self._file_size = offset
+
+    def clear(self):
+        """
+        Discards every frame.
+        """
+        self._spilled.clear()
+        self._held.clear()
+        self._spilled_size = 0
+        self.nbytes = 0
+        self.duration = 0
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._file_size = 0
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2017-2026 Richard Hull and contributors
+# See LICENSE.rst for details.
+
+import os
+import collections
+import multiprocessing
+
+from PIL import Image, ImageChops, GifImagePlugin
+
+
+__all__ = ["gifwriter", "assemble"]
+
+
+def _delta_mask(previous, image):
+    """
+    Returns an ``L``-mode mask which is set wherever the RGB (or ``L``)
+    ``image`` differs from ``previous`` in any of its bands.
+    """
+    diff = ImageChops.difference(previous, image)
+    if diff.mode == "RGB":
+        r, g, b = diff.split()
+        diff = ImageChops.lighter(ImageChops.lighter(r, g), b)
+    return diff.point(lambda v: 255 if v else 0)
+
+
+class gifwriter(object):
+    """
+    Incrementally encodes frames into an animated GIF, so that only the frame
+    currently being written is ever held in memory.
+
+    Each frame is palettized and LZW-encoded as soon as the next (differing)
+    frame is passed to :func:`write`; the header is emitted along with the
+    first frame, and :func:`close` flushes the last frame and appends the
+    trailer.
+
+    Consecutive identical frames are merged into a single frame by extending
+    its duration, and after the first frame only the bounding box of the
+    pixels that changed is encoded, with unchanged pixels inside that box
+    left transparent.
+
+    :param fp: A binary file-like object to write the GIF to.
+    :param loop: Number of times the animation should loop (0 = forever).
+
+    .. versionadded:: 1.8.0
+    """
+    def __init__(self, fp, loop=0):
+        self._fp = fp
+        self._loop = loop
+        self._previous = None
+        self._pending = None
+        self._pending_duration = 0
+        self.frames = 0
+
+    def write(self, image, duration):
+        """
+        Queues ``image`` as the next frame in the animation, encoding the
+        previously queued frame if it differs.
+
+        :param image: The frame to append.
+        :type image: PIL.Image.Image
+        :param duration: How long the frame is shown for, in milliseconds.
+        :type duration: int
+        """
+        if self._pending is not None:
+            if ImageChops.difference(self._pending, image).getbbox() is None:
+                self._pending_duration += duration
+                return
+            self._flush()
+
+        self._pending = image
+        self._pending_duration = duration
+
+    def _flush(self):
+        image, duration = self._pending, self._pending_duration
+        params = {"duration": duration, "disposal": 1}
+
+        if self._previous is None:
+            frame = image.convert("P", palette=Image.Palette.ADAPTIVE)
+            offset = (0, 0)
+
+            # The first frame's palette doubles up as the global color table
+            header, _ = GifImagePlugin.getheader(frame, info={"loop": self._loop, **params})
+            for s in header:
+                self._fp.write(s)
+        else:
+            mask = _delta_mask(self._previous, image)
+            bbox = mask.getbbox()
+            offset = bbox[:2]
+            mask = mask.crop(bbox)
+
+            # Reserve the index after the last quantized color for transparency,
+            # and paint it over every pixel that is unchanged from the previous frame
+            frame = image.crop(bbox).convert("P", palette=Image.Palette.ADAPTIVE, colors=255)
+            palette = frame.getpalette()
+            transparency = len(palette) // 3
+            frame.putpalette(palette + [0, 0, 0])
+            frame.paste(transparency, mask=ImageChops.invert(mask))
+
+            params["transparency"] = transparency
+            params["include_color_table"] = True
+
+        for s in GifImagePlugin.getdata(frame, offset, **params):
+            self._fp.write(s)
+
+        self._previous = image
+        self._pending = None
+        self.frames += 1
+
+    def close(self):
+        """
+        Encodes any outstanding frame and writes the GIF trailer. No further
+        frames may be written afterwards.
+        """
+        if self._pending is not None:
+            self._flush()
+        self._fp.write(b";")
+        self._fp.flush()
+
+
+def _global_palette(frames, sample):
+    """
+    Quantizes up to ``sample`` frames, evenly spaced through ``frames``, down
+    to a single palette of at most 255 colors, leaving room for a transparent
+    index.
+    """
+    count = min(sample, len(frames))
+    images = [frames[i * len(frames) // count][0].convert("RGB") for i in range(count)]
+    width = max(image.width for image in images)
+    montage = Image.new("RGB", (width, sum(image.height for image in images)))
+    y = 0
+    for image in images:
+        montage.paste(image, (0, y))
+        y += image.height
+    return montage.quantize(colors=255, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE)
+
+
+def _encode(previous, frames, palette):
+    """
+    Maps each of the ``(image, duration)`` pairs in ``frames`` onto
+    ``palette`` and LZW-encodes it as a GIF frame, with all but the very
+    first frame of the animation (for which ``previous`` is ``None``)
+    reduced to the region which changed.
+    """
+    transparency = len(palette.getpalette()) // 3
+    chunks = []
+    for image, duration in frames:
+        params = {"duration": duration, "disposal": 1}
+        if previous is None:
+            frame = image.convert("RGB").quantize(palette=palette, dither=Image.Dither.NONE)
+            offset = (0, 0)
+        else:
+            mask = _delta_mask(previous, image)
+            bbox = mask.getbbox() or (0, 0, 1, 1)
+            offset = bbox[:2]
+            frame = image.crop(bbox).convert("RGB").quantize(palette=palette, dither=Image.Dither.NONE)
+            frame.paste(transparency, mask=ImageChops.invert(mask.crop(bbox)))
+            params["transparency"] = transparency
+
+        chunks.append(b"".join(GifImagePlugin.getdata(frame, offset, **params)))
+        previous = image
+    return chunks
+
+
+def assemble(fp, frames, loop=0, workers=None, sample=16, chunk_size=8):
+    """
+    Encodes ``frames`` into an animated GIF, sharing the work between a pool
+    of ``workers`` processes (by default, one per CPU).
+
+    Every frame is mapped onto a single global palette, computed once from
+    a sample of ``sample`` frames. As the frames can then be encoded
+    independently, they are handed out ``chunk_size`` at a time, along with
+    the frame before each chunk, so that only the pixels which changed from
+    it need be encoded; the encoded frames are written out in order.
+
+    Only a few chunks are in progress at any one time, so ``frames`` need not
+    all be held in memory.
+
+    :param fp: A binary file-like object to write the GIF to.
+    :param frames: The frames to encode, as ``(image, duration)`` pairs
+        (with the duration in milliseconds), in a sequence which supports
+        :py:func:`len` and indexing, such as a list or
+        :py:class:`luma.emulator.framestore.framestore`.
+    :param loop: Number of times the animation should loop (0 = forever).
+    :type loop: int
+    :param workers: Number of worker processes.
+    :type workers: int
+    :param sample: Number of frames to compute the global palette from.
+    :type sample: int
+    :param chunk_size: Number of frames encoded by each task.
+    :type chunk_size: int
+
+    .. versionadded:: 1.8.0
+    """
+    assert len(frames) > 0
+    workers = workers or os.cpu_count() or 1
+    palette = _global_palette(frames, sample)
+
+    # The global color table includes the transparent index
+    header = Image.new("P", frames[0][0].size)
+    header.putpalette(palette.getpalette() + [0, 0, 0])
+    for s in GifImagePlugin.getheader(header, info={"loop": loop, "duration": frames[0][1]})[0]:
+        fp.write(s)
+
+    with multiprocessing.Pool(workers) as pool:
+        pending = collections.deque()
+        previous = None
+        for start in range(0, len(frames), chunk_size):
+            chunk = [frames[i] for i in range(start, min(start + chunk_size, len(frames)))]
+            pending.append(pool.apply_async(_encode, (previous, chunk, palette)))
+            previous = chunk[-1][0]
+
+            while len(pending) > 2 * workers or (pending and pending[0].ready()):
+                for chunk in pending.popleft().get():
+                    fp.write(chunk)
+
+        while pending:
+            for chunk in pending.popleft().get():
+                fp.write(chunk)
+
+    fp.write(b";")
+    fp.flush()
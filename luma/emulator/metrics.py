@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2017-2026 Richard Hull and contributors
+# See LICENSE.rst for details.
+
+import json
+import time
+import logging
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["histogram", "recorder"]
+
+
+class histogram(object):
+    """
+    Accumulates durations into buckets whose upper bounds double from one
+    microsecond upwards, so that percentiles can be estimated in constant
+    memory however many samples are recorded.
+
+    .. versionadded:: 1.8.0
+    """
+    BUCKETS = 32
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.nbytes = 0
+        self.buckets = [0] * self.BUCKETS
+
+    def add(self, seconds, nbytes=0):
+        """
+        Records a sample taking ``seconds``, and processing ``nbytes`` bytes.
+        """
+        self.count += 1
+        self.total += seconds
+        self.nbytes += nbytes
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+        index = int(seconds * 1e6).bit_length()
+        self.buckets[min(index, self.BUCKETS - 1)] += 1
+
+    @staticmethod
+    def upper_bound(index):
+        """
+        The upper bound (in seconds) of the bucket at ``index``.
+        """
+        return (1 << index) / 1e6
+
+    def percentile(self, p):
+        """
+        Estimates the ``p``-th percentile as the upper bound of the bucket it
+        falls in (limited to the largest sample seen).
+        """
+        if not self.count:
+            return None
+
+        rank = p / 100.0 * self.count
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(self.upper_bound(index), self.max)
+        return self.max
+
+    def summary(self):
+        """
+        :returns: The sample count, total/mean/min/max and estimated p50,
+            p95 & p99 durations (in seconds), the total number of bytes
+            processed, and the non-empty buckets as ``[upper bound, count]``
+            pairs.
+        :rtype: dict
+        """
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "bytes": self.nbytes,
+            "buckets": [[self.upper_bound(i), n] for i, n in enumerate(self.buckets) if n]
+        }
+
+
+class _stage(object):
+    """
+    Times the body of a ``with`` block, recording it against a named stage.
+    Any bytes processed may be noted by setting ``nbytes``.
+    """
+    __slots__ = ("_recorder", "_name", "_start", "nbytes")
+
+    def __init__(self, recorder, name, nbytes):
+        self._recorder = recorder
+        self._name = name
+        self.nbytes = nbytes
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._recorder.record(self._name, time.perf_counter() - self._start, self.nbytes)
+
+
+class _null_stage(object):
+    """
+    Stands in for :class:`_stage` when instrumentation is not enabled.
+    """
+    @property
+    def nbytes(self):
+        return 0
+
+    @nbytes.setter
+    def nbytes(self, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+null_stage = _null_stage()
+
+
+class recorder(object):
+    """
+    Collects a :class:`histogram` of durations for each named stage of
+    processing, and optionally reports them every ``interval`` seconds, by
+    logging a summary and/or writing them to ``filename`` as JSON.
+
+    Samples may be recorded from any thread.
+
+    :param interval: How often to report, in seconds (``None`` = never).
+    :type interval: float
+    :param filename: JSON file to (over)write with :func:`snapshot` on each
+        report, and when :func:`dump` is called.
+    :type filename: str
+
+    .. versionadded:: 1.8.0
+    """
+    def __init__(self, interval=None, filename=None):
+        self._interval = interval
+        self._filename = filename
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._last_report = time.perf_counter()
+
+    def stage(self, name, nbytes=0):
+        """
+        Returns a context manager which records how long its body takes
+        against ``name``.
+        """
+        return _stage(self, name, nbytes)
+
+    def record(self, name, seconds, nbytes=0):
+        """
+        Records a sample for the stage ``name``.
+        """
+        with self._lock:
+            hist = self._histograms.get(name)
+            if hist is None:
+                hist = self._histograms[name] = histogram()
+            hist.add(seconds, nbytes)
+
+            now = time.perf_counter()
+            report = self._interval is not None and now - self._last_report >= self._interval
+            if report:
+                self._last_report = now
+
+        if report:
+            self.dump()
+
+    def snapshot(self):
+        """
+        :returns: A summary of the samples recorded so far, keyed by stage
+            name.
+        :rtype: dict
+        """
+        with self._lock:
+            return {name: hist.summary() for name, hist in self._histograms.items()}
+
+    def reset(self):
+        """
+        Discards all the samples recorded so far.
+        """
+        with self._lock:
+            self._histograms = {}
+
+    def dump(self):
+        """
+        Logs a summary of each stage, and writes :func:`snapshot` to the
+        JSON file (if one was given).
+        """
+        snapshot = self.snapshot()
+        for name, summary in snapshot.items():
+            logger.info(f"{name}: n={summary['count']} mean={summary['mean'] * 1000:.3f}ms "
+                        f"p95={summary['p95'] * 1000:.3f}ms max={summary['max'] * 1000:.3f}ms "
+                        f"bytes={summary['bytes']}")
+
+        if self._filename is not None:
+            with open(self._filename, "w") as fp:
+                json.dump(snapshot, fp, indent=2, sort_keys=True)
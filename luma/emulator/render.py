@@ -3,86 +3,526 @@
 # See LICENSE.rst for details.
 
 from pathlib import Path
+from functools import lru_cache
 
+from PIL import Image, ImageChops
 
-__all__ = ["transformer"]
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+__all__ = ["transformer", "image_transformer"]
+
+
+@lru_cache(maxsize=None)
+def _sprite(pygame, name):
+    """
+    Loads one of the bundled images, just once for all transformers (the
+    surfaces are never drawn on, only blitted from).
+    """
+    return pygame.image.load(str(Path(__file__).resolve().parent.joinpath("images", name)))
+
+
+@lru_cache(maxsize=None)
+def _image_sprite(name):
+    """
+    Loads one of the bundled images as an RGB :py:mod:`PIL.Image`, just once
+    for all image transformers.
+    """
+    with Image.open(Path(__file__).resolve().parent.joinpath("images", name)) as im:
+        return im.convert("RGB")
 
 
 class transformer(object):
     """
     Helper class used to dispatch transformation operations.
+
+    If a transform is called with ``reuse`` set, the output may be rendered
+    into the same surface as on the previous such call (when it is the same
+    size), rather than allocating a new one. The caller must therefore be done
+    with the result before transforming the next frame.
+
+    .. versionchanged:: 1.8.0
+       Added ``reuse`` parameter to each transform.
     """
+    #: Transforms where the output for each pixel depends only on that pixel
+    #: and its immediate neighbours, so a region of a frame (plus a one pixel
+    #: margin) can be transformed in isolation, giving the same result as the
+    #: whole frame.
+    local = frozenset(["none", "identity", "scale2x", "led_matrix"])
+
     def __init__(self, pygame, width, height, scale):
         self._pygame = pygame
         self._input_size = (width, height)
-        self._output_size = (width * scale, height * scale)
         self._scale = scale
-        base_dir = Path(__file__).resolve().parent
-        self._led_on, self._led_off, self._sevenseg = \
-            [self._pygame.image.load(str(base_dir.joinpath("images", img)))
-             for img in ["led_on.png", "led_off.png", "7-segment.png"]]
+        self._led_rows = None
+        self._led_pixels = None
+        self._led_lit = None
+        self._sevenseg_img = None
+        self._dest = None
+        self._dest_key = None
+
+    def _scaled_size(self, surface):
+        w, h = surface.get_size()
+        return (w * self._scale, h * self._scale)
+
+    def _output(self, size, surface=None):
+        """
+        Returns the surface retained from the previous call if it is of the
+        given size (and the same format as ``surface``, if specified), or else
+        a new one. A palettized surface is given the palette of ``surface``,
+        which changes along with the contrast.
+        """
+        key = (size,) if surface is None else (size, surface.get_bitsize(), surface.get_masks())
+        if self._dest_key != key:
+            self._dest = self._pygame.Surface(size) if surface is None else \
+                self._pygame.Surface(size, 0, surface)
+            self._dest_key = key
+        if surface is not None and surface.get_bitsize() == 8:
+            self._dest.set_palette(surface.get_palette())
+        return self._dest
+
+    def _lit(self, surface):
+        """
+        Returns a function which tests whether a (mapped) pixel value of
+        ``surface`` is lit, i.e. not black. For palettized surfaces, this
+        depends on the palette entry, rather than the index.
+        """
+        if surface.get_bitsize() == 8:
+            return [c[:3] != (0, 0, 0) for c in surface.get_palette()].__getitem__
+        return lambda pixel: pixel & 0xFFFFFF > 0
+
+    def _lit_array(self, surface):
+        """
+        Returns a boolean array, indexed by ``[x, y]``, of the pixels in
+        ``surface`` which are lit.
+        """
+        pixels = self._pygame.surfarray.array2d(surface)
+        if surface.get_bitsize() == 8:
+            palette = numpy.array([c[:3] != (0, 0, 0) for c in surface.get_palette()])
+            return palette[pixels]
+        return pixels & 0xFFFFFF > 0
 
-    def none(self, surface):
+    def none(self, surface, reuse=False):
         """
         No-op transform - used when ``scale`` = 1
         """
         return surface
 
-    def scale2x(self, surface):
+    def scale2x(self, surface, reuse=False):
         """
         Scales using the AdvanceMAME Scale2X algorithm which does a
         'jaggie-less' scale of bitmap graphics.
         """
         assert self._scale == 2
+        if reuse:
+            return self._pygame.transform.scale2x(surface, self._output(self._scaled_size(surface), surface))
         return self._pygame.transform.scale2x(surface)
 
-    def smoothscale(self, surface):
+    def smoothscale(self, surface, reuse=False):
         """
         Smooth scaling using MMX or SSE extensions if available
         """
-        return self._pygame.transform.smoothscale(surface, self._output_size)
+        size = self._scaled_size(surface)
+        if reuse:
+            return self._pygame.transform.smoothscale(surface, size, self._output(size, surface))
+        return self._pygame.transform.smoothscale(surface, size)
 
-    def identity(self, surface):
+    def identity(self, surface, reuse=False):
         """
         Fast scale operation that does not sample the results
         """
-        return self._pygame.transform.scale(surface, self._output_size)
+        size = self._scaled_size(surface)
+        if reuse:
+            return self._pygame.transform.scale(surface, size, self._output(size, surface))
+        return self._pygame.transform.scale(surface, size)
 
-    def led_matrix(self, surface):
+    def led_matrix(self, surface, reuse=False):
         """
         Transforms the input surface into an LED matrix (1 pixel = 1 LED)
+
+        When NumPy is installed, the whole matrix is drawn in one go, and if
+        ``reuse`` is set, the output is retained between calls so that only
+        the LEDs which have changed since the previous frame are redrawn.
+
+        .. versionchanged:: 1.8.0
+           Vectorized with NumPy, if it is installed.
         """
-        scale = self._led_on.get_width()
-        w, h = self._input_size
+        if numpy is None:
+            return self._led_matrix_blit(surface, reuse)
+
+        led_on = _sprite(self._pygame, "led_on.png")
+        scale = led_on.get_width()
+        if self._led_rows is None:
+            # Each row of pixels in the off/on sprites, as a single opaque
+            # item, so that a whole row can be copied by one gather
+            sprites = [self._pygame.image.tostring(led, "RGB")
+                       for led in (_sprite(self._pygame, "led_off.png"), led_on)]
+            self._led_rows = numpy.frombuffer(b"".join(sprites), dtype=(numpy.void, scale * 3))
+
+        # Output rows are laid out as [y][sprite row][x], so each item picks
+        # out the relevant row of either the off (0) or on (1) sprite. The
+        # result is wrapped (rather than copied) by the returned surface
+        w, h = surface.get_size()
+        lit = self._lit_array(surface).T
+        if reuse and self._led_lit is not None and self._led_lit.shape == lit.shape:
+            # The retained rows already show the previous frame, so only the
+            # LEDs which have since changed need to be rewritten
+            ys, xs = numpy.nonzero(lit != self._led_lit)
+            self._led_pixels[ys, :, xs] = self._led_rows.reshape(2, scale)[lit[ys, xs].astype(numpy.intp)]
+        else:
+            index = lit[:, None, :] * scale + numpy.arange(scale)[None, :, None]
+            rows = self._led_rows.take(index)
+            if not reuse:
+                return self._pygame.image.frombuffer(rows, (w * scale, h * scale), "RGB")
+            self._led_pixels = rows
+
+        self._led_lit = lit
+        return self._pygame.image.frombuffer(self._led_pixels, (w * scale, h * scale), "RGB")
+
+    def _led_matrix_blit(self, surface, reuse):
+        led_on = _sprite(self._pygame, "led_on.png")
+        led_off = _sprite(self._pygame, "led_off.png")
+        scale = led_on.get_width()
+        w, h = surface.get_size()
         pix = self._pygame.PixelArray(surface)
-        img = self._pygame.Surface((w * scale, h * scale))
+        lit = self._lit(surface)
+        size = (w * scale, h * scale)
+        img = self._output(size) if reuse else self._pygame.Surface(size)
 
         for y in range(h):
             for x in range(w):
-                led = self._led_on if pix[x, y] & 0xFFFFFF > 0 else self._led_off
+                led = led_on if lit(pix[x, y]) else led_off
                 img.blit(led, (x * scale, y * scale))
 
         return img
 
-    def seven_segment(self, surface):
+    def seven_segment(self, surface, reuse=False):
+        """
+        Transforms the input surface into a row of seven-segment digits, where
+        each column of pixels describes the lit segments of one digit.
+
+        The rendered row is retained between calls, and only the digits whose
+        segments have changed since the previous frame are redrawn.
+
+        .. versionchanged:: 1.8.0
+           Redraw only changed digits, and pack bits with NumPy if installed.
+        """
         w, h = self._input_size
         cw, ch = 30, 50
-        pix = self._pygame.PixelArray(surface)
-        img = self._pygame.Surface((w * cw, h * ch // 8))
 
+        if self._sevenseg_img is None:
+            # Flatten the (translucent) glyph atlas onto black once, so that
+            # a glyph can be blitted straight over whatever digit was there
+            glyphs = _sprite(self._pygame, "7-segment.png")
+            atlas = self._pygame.Surface(glyphs.get_size())
+            atlas.blit(glyphs, (0, 0))
+            self._sevenseg_atlas = atlas
+            self._sevenseg_img = self._pygame.Surface((w * cw, h * ch // 8))
+            self._sevenseg_bytes = [None] * w
+
+        img = self._sevenseg_img
+        for x, byte in enumerate(self._segment_bytes(surface)):
+            if self._sevenseg_bytes[x] != byte:
+                self._sevenseg_bytes[x] = byte
+                i = (byte % 16) * cw
+                j = (byte // 16) * ch
+                img.blit(self._sevenseg_atlas, ((w - x - 1) * cw, 0), area=self._pygame.Rect(i, j, cw, ch))
+
+        if reuse:
+            # The retained row can be handed out as is, provided it is not
+            # redrawn before the caller is done with it
+            return img
+        return img.copy()
+
+    def _segment_bytes(self, surface):
+        """
+        Packs each column of the input surface into a byte, topmost pixel
+        first (disregarding the bottom row), then drops any values > 127.
+        """
+        w, h = self._input_size
+
+        if numpy is not None:
+            lit = self._lit_array(surface)
+            rows = numpy.arange(max(0, h - 8), h - 1)
+            return (lit[:, rows] @ (1 << (h - 2 - rows))).tolist()
+
+        pix = self._pygame.PixelArray(surface)
+        lit = self._lit(surface)
+        values = []
         for x in range(w):
             byte = 0
             for y in range(h - 1):
                 byte <<= 1
-                if pix[x, y] & 0xFFFFFF > 0:
+                if lit(pix[x, y]):
                     byte |= 1
+            values.append(byte & 0x7F)
 
-            # Drop any values > 127
-            byte &= 0x7F
+        return values
 
-            i = (byte % 16) * cw
-            j = (byte // 16) * ch
 
-            img.blit(self._sevenseg, ((w - x - 1) * cw, 0), area=self._pygame.Rect(i, j, cw, ch))
+# Point tables mapping zero to 255 (and anything else to 0), and vice versa
+_ZERO = [255] + [0] * 255
+_NONZERO = [0] + [255] * 255
 
-        return img
+
+class image_transformer(object):
+    """
+    Performs the same transformation operations as :class:`transformer`,
+    but on :py:mod:`PIL.Image` objects (in mode ``L`` or ``RGB``) rather than
+    pygame surfaces, so pygame is not needed at all.
+
+    The output is identical to that of :class:`transformer`, except for
+    ``smoothscale`` when NumPy is not installed (or where pygame does not use
+    its MMX/SSE implementation).
+
+    .. versionadded:: 1.8.0
+    """
+    local = transformer.local
+
+    def __init__(self, width, height, scale):
+        self._input_size = (width, height)
+        self._scale = scale
+        self._led_tiles = None
+        self._led_rows = None
+        self._led_index = None
+        self._led_pixels = None
+        self._sevenseg_img = None
+        self._patterns = None
+
+    def _scaled_size(self, image):
+        return (image.width * self._scale, image.height * self._scale)
+
+    @staticmethod
+    def _mask(diff, table):
+        """
+        Returns an ``L`` mask, set according to ``table`` from the largest
+        difference across all bands.
+        """
+        if diff.mode != "L":
+            r, g, b = diff.split()
+            diff = ImageChops.lighter(ImageChops.lighter(r, g), b)
+        return diff.point(table)
+
+    def _equal(self, image1, image2):
+        return self._mask(ImageChops.difference(image1, image2), _ZERO)
+
+    @staticmethod
+    def _neighbour(image, dx, dy):
+        """
+        Returns ``image`` shifted by one pixel (``dx`` or ``dy``), with the
+        edge that is uncovered duplicated from ``image``, so that each pixel
+        at the edges neighbours itself.
+        """
+        w, h = image.size
+        shifted = ImageChops.offset(image, dx, dy)
+        if dx > 0:
+            shifted.paste(image.crop((0, 0, 1, h)), (0, 0))
+        elif dx < 0:
+            shifted.paste(image.crop((w - 1, 0, w, h)), (w - 1, 0))
+        elif dy > 0:
+            shifted.paste(image.crop((0, 0, w, 1)), (0, 0))
+        else:
+            shifted.paste(image.crop((0, h - 1, w, h)), (0, h - 1))
+        return shifted
+
+    def none(self, image):
+        """
+        No-op transform - used when ``scale`` = 1
+        """
+        return image
+
+    def scale2x(self, image):
+        """
+        Scales using the AdvanceMAME Scale2X algorithm which does a
+        'jaggie-less' scale of bitmap graphics.
+        """
+        assert self._scale == 2
+        if numpy is not None:
+            return self._scale2x_vectorized(image)
+
+        w, h = image.size
+        size = (w * 2, h * 2)
+
+        # Each pixel E, with neighbours B (above), D (left), F (right) & H
+        # (below), becomes four: E0 E1 / E2 E3. Where B != H and D != F, each
+        # takes the color of the two neighbours adjacent to it, if they match
+        b, d, f, h_ = [self._neighbour(image, dx, dy) for dx, dy in [(0, 1), (1, 0), (-1, 0), (0, -1)]]
+        gate = ImageChops.darker(ImageChops.invert(self._equal(b, h_)),
+                                 ImageChops.invert(self._equal(d, f)))
+
+        if self._patterns is None or self._patterns[0].size != size:
+            # Masks selecting each of the four output pixels for every input pixel
+            self._patterns = []
+            for n in range(4):
+                cell = [0, 0, 0, 0]
+                cell[n] = 255
+                rows = [bytes(cell[:2]) * w, bytes(cell[2:]) * w]
+                self._patterns.append(Image.frombytes("L", size, (rows[0] + rows[1]) * h))
+
+        out = image.resize(size, Image.Resampling.NEAREST)
+        for n, (neighbour1, neighbour2, color) in enumerate([(d, b, d), (b, f, f), (d, h_, d), (h_, f, f)]):
+            mask = ImageChops.darker(gate, self._equal(neighbour1, neighbour2))
+            mask = ImageChops.darker(mask.resize(size, Image.Resampling.NEAREST), self._patterns[n])
+            out.paste(color.resize(size, Image.Resampling.NEAREST), mask=mask)
+        return out
+
+    def _scale2x_vectorized(self, image):
+        e = numpy.asarray(image)
+        if image.mode == "RGB":
+            # Pack each pixel into a single value, to compare them in one go
+            e = e.astype(numpy.uint32)
+            e = e[..., 0] | e[..., 1] << 8 | e[..., 2] << 16
+
+        b = numpy.concatenate([e[:1], e[:-1]])
+        h = numpy.concatenate([e[1:], e[-1:]])
+        d = numpy.concatenate([e[:, :1], e[:, :-1]], axis=1)
+        f = numpy.concatenate([e[:, 1:], e[:, -1:]], axis=1)
+        gate = (b != h) & (d != f)
+
+        out = numpy.empty((e.shape[0] * 2, e.shape[1] * 2), dtype=e.dtype)
+        out[0::2, 0::2] = numpy.where(gate & (d == b), d, e)
+        out[0::2, 1::2] = numpy.where(gate & (b == f), f, e)
+        out[1::2, 0::2] = numpy.where(gate & (d == h), d, e)
+        out[1::2, 1::2] = numpy.where(gate & (h == f), f, e)
+
+        if image.mode == "RGB":
+            out = numpy.stack([out & 0xFF, out >> 8 & 0xFF, out >> 16], axis=-1).astype(numpy.uint8)
+        return Image.fromarray(out, image.mode)
+
+    def smoothscale(self, image):
+        """
+        Smooth scaling, using the same linear interpolation as pygame's MMX &
+        SSE implementations if NumPy is installed, otherwise Pillow's
+        bilinear resampling.
+        """
+        if numpy is None:
+            return image.resize(self._scaled_size(image), Image.Resampling.BILINEAR)
+
+        pixels = numpy.asarray(image)
+        pixels = self._expand(pixels, 1, image.width * self._scale)
+        pixels = self._expand(pixels, 0, image.height * self._scale)
+        return Image.fromarray(pixels, image.mode)
+
+    @staticmethod
+    def _expand(pixels, axis, size):
+        """
+        Stretches ``pixels`` along ``axis`` to ``size``, interpolating between
+        neighbouring pixels with 8-bit fractional weights.
+        """
+        length = pixels.shape[axis]
+        pos = numpy.arange(size) * (length - 1)
+        index = pos // size
+        weight1 = 0x100 * (pos % size) // size
+
+        shape = [1] * pixels.ndim
+        shape[axis] = size
+        weight1 = weight1.reshape(shape)
+        pixel0 = pixels.take(index, axis=axis).astype(numpy.int32)
+        pixel1 = pixels.take(numpy.minimum(index + 1, length - 1), axis=axis).astype(numpy.int32)
+        return ((pixel0 * (0x100 - weight1) + pixel1 * weight1) >> 8).astype(numpy.uint8)
+
+    def identity(self, image):
+        """
+        Fast scale operation that does not sample the results
+        """
+        return image.resize(self._scaled_size(image), Image.Resampling.NEAREST)
+
+    def _lit(self, image):
+        """
+        Returns an ``L`` mask of the pixels in ``image`` which are lit, i.e.
+        not black.
+        """
+        return self._mask(image, _NONZERO)
+
+    def led_matrix(self, image):
+        """
+        Transforms the input image into an LED matrix (1 pixel = 1 LED)
+
+        When NumPy is installed, each row of pixels of the matrix is picked
+        out from the LED images in one go, as by :class:`transformer`.
+        """
+        led_on = _image_sprite("led_on.png")
+        scale = led_on.width
+        size = (image.width * scale, image.height * scale)
+
+        if numpy is not None:
+            if self._led_rows is None:
+                # Each row of pixels in the off/on sprites, as a single opaque
+                # item, so that a whole row can be copied by one gather
+                sprites = [led.tobytes() for led in (_image_sprite("led_off.png"), led_on)]
+                self._led_rows = numpy.frombuffer(b"".join(sprites), dtype=(numpy.void, scale * 3))
+
+            # Output rows are laid out as [y][sprite row][x], so each item
+            # picks out the relevant row of either the off (0) or on (1)
+            # sprite. The index and rows are gathered into arrays retained
+            # from the previous frame, as PIL copies the result anyway (and
+            # the index is always in range, so need not be checked)
+            shape = (image.height, scale, image.width)
+            if self._led_pixels is None or self._led_pixels.shape != shape:
+                self._led_index = numpy.empty(shape, dtype=numpy.intp)
+                self._led_pixels = numpy.empty(shape, dtype=self._led_rows.dtype)
+
+            lit = numpy.asarray(self._lit(image)) > 0
+            numpy.add(lit[:, None, :] * scale, numpy.arange(scale)[None, :, None], out=self._led_index)
+            self._led_rows.take(self._led_index, out=self._led_pixels, mode="clip")
+            return Image.frombytes("RGB", size, self._led_pixels)
+
+        if self._led_tiles is None or self._led_tiles[0].size != size:
+            # Every LED off, and every LED on, to pick from according to the
+            # (scaled up) lit pixels
+            self._led_tiles = []
+            for led in (_image_sprite("led_off.png"), led_on):
+                row = Image.new("RGB", (size[0], scale))
+                for x in range(0, size[0], scale):
+                    row.paste(led, (x, 0))
+                tiles = Image.new("RGB", size)
+                for y in range(0, size[1], scale):
+                    tiles.paste(row, (0, y))
+                self._led_tiles.append(tiles)
+
+        lit = self._lit(image).resize(size, Image.Resampling.NEAREST)
+        return Image.composite(self._led_tiles[1], self._led_tiles[0], lit)
+
+    def seven_segment(self, image):
+        """
+        Transforms the input image into a row of seven-segment digits, where
+        each column of pixels describes the lit segments of one digit. Only
+        the digits whose segments have changed since the previous frame are
+        redrawn.
+        """
+        w, h = self._input_size
+        cw, ch = 30, 50
+
+        if self._sevenseg_img is None:
+            self._sevenseg_img = Image.new("RGB", (w * cw, h * ch // 8))
+            self._sevenseg_bytes = [None] * w
+
+        img = self._sevenseg_img
+        atlas = _image_sprite("7-segment.png")
+        for x, byte in enumerate(self._segment_bytes(image)):
+            if self._sevenseg_bytes[x] != byte:
+                self._sevenseg_bytes[x] = byte
+                i = (byte % 16) * cw
+                j = (byte // 16) * ch
+                img.paste(atlas.crop((i, j, i + cw, j + ch)), ((w - x - 1) * cw, 0))
+
+        return img.copy()
+
+    def _segment_bytes(self, image):
+        """
+        Packs each column of the input image into a byte, topmost pixel
+        first (disregarding the bottom row), then drops any values > 127.
+        """
+        w, h = self._input_size
+        lit = self._lit(image).tobytes()
+        values = []
+        for x in range(w):
+            byte = 0
+            for y in range(h - 1):
+                byte = (byte << 1) | (lit[y * w + x] & 1)
+            values.append(byte & 0x7F)
+
+        return values
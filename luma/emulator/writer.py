@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2017-2026 Richard Hull and contributors
+# See LICENSE.rst for details.
+
+import queue
+import logging
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["background_writer"]
+
+
+_STOP = object()
+
+
+class background_writer(object):
+    """
+    Hands work off to a pool of worker threads through a bounded queue, so
+    that slow operations (such as encoding and writing files) do not hold up
+    the caller.
+
+    When the queue is full, ``overflow`` determines what happens to a newly
+    submitted item:
+
+    * ``"block"`` - wait until there is room in the queue
+    * ``"drop_oldest"`` - discard the oldest queued item to make room
+    * ``"drop_newest"`` - discard the item being submitted
+
+    :param func: Called with the arguments of each submitted item, on a
+        worker thread.
+    :param workers: Number of worker threads.
+    :type workers: int
+    :param maxsize: Maximum number of items waiting in the queue.
+    :type maxsize: int
+    :param overflow: Back-pressure policy, one of ``"block"``,
+        ``"drop_oldest"`` or ``"drop_newest"``.
+    :type overflow: str
+    :param on_drop: If given, called with the arguments of each item which is
+        discarded, on the submitting thread.
+
+    .. versionadded:: 1.8.0
+    """
+    def __init__(self, func, workers=1, maxsize=16, overflow="block", on_drop=None):
+        assert workers >= 1
+        assert maxsize >= 1
+        assert overflow in ("block", "drop_oldest", "drop_newest")
+        self._func = func
+        self._overflow = overflow
+        self._on_drop = on_drop
+        self._queue = queue.Queue(maxsize)
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self._threads = [threading.Thread(target=self._run, daemon=True)
+                         for _ in range(workers)]
+        for t in self._threads:
+            t.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                self._func(*item)
+            except Exception:
+                logger.exception("Background write failed")
+            finally:
+                self._queue.task_done()
+
+    def submit(self, *args):
+        """
+        Queues ``args`` to be passed to ``func`` on a worker thread.
+
+        :returns: ``False`` if the item was dropped because the queue was
+            full, otherwise ``True``.
+        :rtype: bool
+        """
+        if self._overflow == "block":
+            self._queue.put(args)
+            return True
+
+        with self._lock:
+            while True:
+                try:
+                    self._queue.put_nowait(args)
+                    return True
+                except queue.Full:
+                    if self._overflow == "drop_newest":
+                        self._drop(args)
+                        return False
+                try:
+                    oldest = self._queue.get_nowait()
+                except queue.Empty:
+                    continue
+                self._queue.task_done()
+                self._drop(oldest)
+
+    def _drop(self, item):
+        self.dropped += 1
+        if self._on_drop is not None:
+            self._on_drop(*item)
+
+    def join(self):
+        """
+        Waits for all queued items to be processed, then stops the worker
+        threads. No further items may be submitted afterwards.
+        """
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for t in self._threads:
+            t.join()
+        self._threads = []
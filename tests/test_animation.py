@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 Richard Hull and contributors
+# See LICENSE.rst for details.
+
+"""
+Tests for :py:class:`luma.emulator.device.animation`.
+"""
+
+import sys
+from tempfile import NamedTemporaryFile
+
+import pytest
+
+from PIL import Image, ImageChops
+
+from luma.core.render import canvas
+from luma.emulator.device import animation
+
+from .baseline_data import primitives
+from .helpers import test_font
+
+
+def record(device, texts):
+    """
+    Displays the primitives with each of ``texts`` on top, returning the
+    transformed frames.
+    """
+    frames = []
+    for text in texts:
+        with canvas(device) as draw:
+            primitives(device, draw)
+            draw.text((30, 10), text=text, font=test_font, fill="white")
+        frames.append(device.to_image(device._last_image).convert("RGB"))
+    device.cleanup()
+    return frames
+
+
+@pytest.mark.parametrize("suffix", [".png", ".webp"])
+@pytest.mark.parametrize("mode", ["1", "RGB"])
+def test_animation(suffix, mode):
+    with NamedTemporaryFile(suffix=suffix) as temp:
+        device = animation(filename=temp.name, mode=mode)
+        frames = record(device, ["Blip", "Blip", "Blipvert"])
+
+        with Image.open(temp.name) as actual:
+            assert actual.n_frames == 2
+            for frame, expected in enumerate([frames[0], frames[2]]):
+                actual.seek(frame)
+                assert ImageChops.difference(actual.convert("RGB"), expected).getbbox() is None
+
+        if suffix == ".png":
+            with Image.open(temp.name) as actual:
+                assert actual.info["duration"] == 20
+
+
+def test_animation_window():
+    with NamedTemporaryFile(suffix='.png') as temp:
+        device = animation(filename=temp.name, duration=0.1, window=0.2)
+        frames = record(device, [str(n) for n in range(6)])
+
+        with Image.open(temp.name) as actual:
+            assert actual.n_frames == 2
+            actual.seek(1)
+            assert ImageChops.difference(actual.convert("RGB"), frames[-1]).getbbox() is None
+
+
+def test_animation_raw():
+    with NamedTemporaryFile(suffix='.rgb') as temp:
+        device = animation(filename=temp.name, mode="1")
+        frames = record(device, ["Blip", "Blip", "Blipvert"])
+
+        with open(temp.name, "rb") as fp:
+            assert fp.read() == b"".join(frame.tobytes() for frame in frames)
+
+
+def read_y4m(data):
+    header, data = data.split(b"\n", 1)
+    params = {p[:1]: p[1:] for p in header.decode("ascii").split(" ")[1:]}
+    width, height = int(params["W"]), int(params["H"])
+    plane = width * height
+    frames = []
+    while data:
+        assert data.startswith(b"FRAME\n")
+        data = data[6:]
+        bands = [Image.frombytes("L", (width, height), data[i * plane:(i + 1) * plane]) for i in range(3)]
+        frames.append(Image.merge("YCbCr", bands))
+        data = data[3 * plane:]
+    return params, frames
+
+
+@pytest.mark.parametrize("pipe", [False, True])
+def test_animation_y4m(pipe):
+    with NamedTemporaryFile(suffix='.y4m') as temp:
+        command = [sys.executable, "-c", "import sys, shutil; shutil.copyfileobj(sys.stdin.buffer, open(sys.argv[1], 'wb'))",
+                   temp.name] if pipe else None
+        device = animation(filename=temp.name, duration=0.04, command=command)
+        frames = record(device, ["Blip", "Blip", "Blipvert"])
+
+        with open(temp.name, "rb") as fp:
+            params, actual = read_y4m(fp.read())
+
+        assert params["W"] == "256" and params["H"] == "128"
+        assert params["F"] == "25:1"
+        assert params["C"] == "444"
+        assert len(actual) == 3
+        for im, expected in zip(actual, frames):
+            assert im.tobytes() == expected.convert("YCbCr").tobytes()
+
+
+def test_animation_unsupported():
+    with pytest.raises(AssertionError):
+        animation(filename="luma.bmp")
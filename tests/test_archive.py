@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 Richard Hull and contributors
+# See LICENSE.rst for details.
+
+"""
+Tests for :py:mod:`luma.emulator.archive`.
+"""
+
+import io
+import zipfile
+import tarfile
+from tempfile import TemporaryDirectory
+from pathlib import Path
+
+import pytest
+
+from PIL import Image, ImageChops
+
+from luma.emulator.archive import archive_writer, archive_reader
+
+
+def png(color):
+    fp = io.BytesIO()
+    Image.new("RGB", (8, 4), color).save(fp, "PNG")
+    return fp.getvalue()
+
+
+FRAMES = {1: png("red"), 3: png("green"), 2: png("blue")}
+
+
+@pytest.fixture
+def tmpdir():
+    with TemporaryDirectory() as dirname:
+        yield Path(dirname)
+
+
+def write(filename, close=True):
+    writer = archive_writer(str(filename))
+    for number, data in FRAMES.items():
+        writer.add(number, f"frame_{number}.png", data)
+    assert writer.frames == 3
+    if close:
+        writer.close()
+    else:
+        writer._file.flush()
+
+
+@pytest.mark.parametrize("suffix", [".zip", ".tar", ".frames"])
+def test_roundtrip(tmpdir, suffix):
+    fname = tmpdir / f"luma{suffix}"
+    write(fname)
+
+    with archive_reader(str(fname)) as reader:
+        assert len(reader) == 3
+        assert reader.numbers() == [1, 2, 3]
+        assert 2 in reader and 4 not in reader
+        for number, data in FRAMES.items():
+            assert reader.read(number) == data
+
+        im = reader.frame(3)
+        assert ImageChops.difference(im.convert("RGB"), Image.new("RGB", (8, 4), "green")).getbbox() is None
+
+        with pytest.raises(KeyError):
+            reader.read(4)
+
+
+def test_zip_stored(tmpdir):
+    fname = tmpdir / "luma.zip"
+    write(fname)
+    with zipfile.ZipFile(fname) as zf:
+        assert zf.namelist() == ["frame_1.png", "frame_3.png", "frame_2.png"]
+        assert all(info.compress_type == zipfile.ZIP_STORED for info in zf.infolist())
+
+
+def test_tar_members(tmpdir):
+    fname = tmpdir / "luma.tar"
+    write(fname)
+    with tarfile.open(fname) as tf:
+        assert tf.getnames() == ["frame_1.png", "frame_3.png", "frame_2.png"]
+        assert tf.extractfile("frame_2.png").read() == FRAMES[2]
+
+
+def test_foreign_zip(tmpdir):
+    fname = tmpdir / "other.zip"
+    with zipfile.ZipFile(fname, "w") as zf:
+        zf.writestr("a.png", FRAMES[1])
+        zf.writestr("b.png", FRAMES[2])
+
+    with archive_reader(str(fname)) as reader:
+        assert reader.numbers() == [1, 2]
+        assert reader.read(2) == FRAMES[2]
+
+
+def test_frames_unclosed(tmpdir):
+    fname = tmpdir / "luma.frames"
+    write(fname, close=False)
+
+    # Chop off half of the last frame, as if the writer was interrupted
+    data = fname.read_bytes()
+    fname.write_bytes(data[:-len(FRAMES[2]) // 2])
+
+    with archive_reader(str(fname)) as reader:
+        assert reader.numbers() == [1, 3]
+        assert reader.read(3) == FRAMES[3]
+
+
+def test_unsupported(tmpdir):
+    with pytest.raises(AssertionError):
+        archive_writer(str(tmpdir / "luma.bmp"))
+
+    fname = tmpdir / "luma.dat"
+    fname.write_bytes(b"not frames")
+    with pytest.raises(AssertionError):
+        archive_reader(str(fname), format="frames")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 Richard Hull and contributors
+# See LICENSE.rst for details.
+
+"""
+Tests for :py:class:`luma.emulator.device.asciiart`.
+"""
+
+import sys
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from PIL import Image
+from luma.core.render import canvas
+
+from .baseline_data import primitives
+from .helpers import get_reference_file
+
+ASCII_AVAILABLE = True
+try:
+    import curses
+    from luma.emulator.device import asciiart
+except ImportError:
+    ASCII_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(not ASCII_AVAILABLE, reason="curses not available")
+
+
+@pytest.fixture
+def stdscr():
+    """
+    Stands in for the terminal, so that curses is never initialized.
+    """
+    screen = MagicMock()
+    screen.getmaxyx.return_value = (40, 100)
+    with patch.multiple(curses, initscr=MagicMock(return_value=screen),
+                        start_color=MagicMock(), use_default_colors=MagicMock(),
+                        init_pair=MagicMock(), noecho=MagicMock(), cbreak=MagicMock(),
+                        nocbreak=MagicMock(), echo=MagicMock(), endwin=MagicMock(),
+                        color_pair=MagicMock(side_effect=lambda n: n << 8)), \
+            patch.object(curses, "COLORS", 256, create=True):
+        yield screen
+
+
+def new_device(**kwargs):
+    stdout, stderr = sys.stdout, sys.stderr
+    device = asciiart(**kwargs)
+    device.cleanup = MagicMock()
+    sys.stdout, sys.stderr = stdout, stderr
+    return device
+
+
+def test_char_ramp_shared(stdscr):
+    first = new_device()
+    second = new_device()
+    assert first._chars is second._chars
+    assert len(first._chars) == 96
+
+
+def screen_contents(stdscr):
+    """
+    Replays the ``addstr`` calls made to the mocked screen.
+    """
+    cells = {}
+    for (y, x, text, attr), _ in stdscr.addstr.call_args_list:
+        for i, ch in enumerate(text):
+            cells[(y, x + i)] = (ch, attr >> 8)
+    return cells
+
+
+def test_display(stdscr):
+    device = new_device()
+    with canvas(device) as draw:
+        primitives(device, draw)
+
+    image = Image.open(get_reference_file("scale2x.png"))
+    art = list(device._generate_art(image, 100, 50))
+    expected = {(i // 100, i % 100): cell for i, cell in enumerate(art[:40 * 100])}
+    assert screen_contents(stdscr) == expected
+
+    # Runs of the same color are written together
+    assert stdscr.addstr.call_count < len(expected) / 2
+
+
+def test_display_changed_rows_only(stdscr):
+    device = new_device()
+    with canvas(device) as draw:
+        primitives(device, draw)
+
+    stdscr.addstr.reset_mock()
+    with canvas(device) as draw:
+        primitives(device, draw)
+    stdscr.addstr.assert_not_called()
+
+    with canvas(device) as draw:
+        primitives(device, draw)
+        draw.rectangle((0, 30, 10, 33), fill="white")
+    redrawn = {y for (y, x, text, attr), _ in stdscr.addstr.call_args_list}
+    assert 0 < len(redrawn) < 40 / 2
@@ -69,3 +69,53 @@ def test_cleanup():
 
         digest = hashlib.md5(out).hexdigest()
         assert digest == '3139690363a9edf4c03d553b36a37fe6'
+
+
+def test_display_changes_only():
+    # If ascii art works, then do the test otherwise just end the function call
+    if ASCII_AVAILABLE:
+        scr_height = 40
+        scr_width = 100
+        fake_result = struct.pack('HHHH', scr_height, scr_width, 600, 616)
+
+        with redirect_stdout() as f:
+            sys.stdout.fileno = lambda: 1
+            with patch('fcntl.ioctl', return_value=fake_result):
+                device = asciiblock()
+                with canvas(device) as draw:
+                    primitives(device, draw)
+                full = len(f.getvalue())
+
+                with canvas(device) as draw:
+                    primitives(device, draw)
+                assert len(f.getvalue()) == full
+
+                with canvas(device) as draw:
+                    primitives(device, draw)
+                    draw.point((10, 10), fill="white")
+                partial = f.getvalue()[full:]
+
+        device.cleanup = noop
+        assert 0 < len(partial) < full / 10
+        assert partial.startswith('\x1b[4;6H')
+
+
+def test_display_truecolor(monkeypatch):
+    # If ascii art works, then do the test otherwise just end the function call
+    if ASCII_AVAILABLE:
+        scr_height = 40
+        scr_width = 100
+        fake_result = struct.pack('HHHH', scr_height, scr_width, 600, 616)
+        monkeypatch.setenv('COLORTERM', 'truecolor')
+
+        with redirect_stdout() as f:
+            sys.stdout.fileno = lambda: 1
+            with patch('fcntl.ioctl', return_value=fake_result):
+                device = asciiblock(color_mode='auto')
+                with canvas(device) as draw:
+                    draw.rectangle((0, 0, 9, 9), fill=(1, 2, 3))
+
+        device.cleanup = noop
+        out = f.getvalue()
+        assert '\x1b[38;2;1;2;3;48;2;1;2;3m' in out
+        assert '38;5;' not in out
@@ -7,13 +7,21 @@
 Tests for :py:class:`luma.emulator.device.capture`.
 """
 
-from tempfile import NamedTemporaryFile
+import os
+import threading
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+from unittest.mock import patch
+
+import pytest
+
+from PIL import Image, ImageChops
 
 from luma.core.render import canvas
+from luma.emulator.archive import archive_reader
 from luma.emulator.device import capture
 
 from .baseline_data import primitives
-from .helpers import assert_identical
+from .helpers import assert_identical, get_reference_file
 
 
 def test_display():
@@ -26,3 +34,85 @@ def test_display():
             primitives(device, draw)
 
         assert_identical('capture.png', fname)
+
+
+def test_display_background_writer():
+    with NamedTemporaryFile(suffix='.png', delete=True) as temp:
+        fname = temp.name
+        device = capture(file_template=fname, transform="none", workers=2)
+
+        with canvas(device) as draw:
+            primitives(device, draw)
+
+        device.cleanup()
+        assert_identical('capture.png', fname)
+        assert device.dropped == 0
+
+
+@pytest.mark.parametrize("overflow,expected", [
+    ("drop_oldest", ["luma_000002.png", "luma_000003.png"]),
+    ("drop_newest", ["luma_000003.png", "luma_000004.png"]),
+])
+def test_display_dropped(overflow, expected):
+    started = threading.Event()
+    release = threading.Event()
+
+    def save(self, frame, number):
+        started.set()
+        release.wait()
+
+    image = Image.new("RGB", (128, 64))
+    with patch.object(capture, "_save", save), patch("luma.emulator.device.logger") as logger:
+        device = capture(transform="none", workers=1, queue_size=1, overflow=overflow)
+        device.display(image)
+        started.wait()
+        for _ in range(3):
+            device.display(image)
+        assert device.dropped == 2
+
+        release.set()
+        device.cleanup()
+
+    assert device.dropped == 2
+    assert [args[0] for args, _ in logger.debug.call_args_list] == [f"Dropped: {name}" for name in expected]
+
+
+def test_display_monochrome():
+    with NamedTemporaryFile(suffix='.png', delete=True) as temp:
+        device = capture(file_template=temp.name, mode="1")
+        with canvas(device) as draw:
+            primitives(device, draw)
+
+        with Image.open(temp.name) as im:
+            assert im.mode == "RGB"
+            assert im.size == (256, 128)
+
+
+def test_display_pil_backend():
+    with NamedTemporaryFile(suffix='.png', delete=True) as temp:
+        fname = temp.name
+        with patch.dict('sys.modules', {'pygame': None}):
+            device = capture(file_template=fname, transform="scale2x", backend="pil")
+            with canvas(device) as draw:
+                primitives(device, draw)
+
+        assert_identical('scale2x.png', fname)
+
+
+@pytest.mark.parametrize("suffix", [".zip", ".tar", ".frames"])
+@pytest.mark.parametrize("workers", [0, 2])
+def test_display_archive(suffix, workers):
+    with TemporaryDirectory() as dirname:
+        fname = os.path.join(dirname, "luma" + suffix)
+        device = capture(transform="none", archive=fname, workers=workers)
+        for _ in range(3):
+            with canvas(device) as draw:
+                primitives(device, draw)
+        device.cleanup()
+
+        assert os.listdir(dirname) == ["luma" + suffix]
+        with archive_reader(fname) as reader, Image.open(get_reference_file("capture.png")) as expected:
+            assert reader.numbers() == [1, 2, 3]
+            for number in reader.numbers():
+                im = reader.frame(number)
+                assert ImageChops.difference(im.convert("RGB"), expected.convert("RGB")).getbbox() is None
@@ -7,8 +7,43 @@
 Tests for :py:class:`luma.emulator.clut`.
 """
 
-from luma.emulator.clut import rgb2short
+from PIL import Image
+
+from luma.emulator.clut import rgb2short, image2short, get_palette
 
 
 def test_rgb2short():
     assert rgb2short(100, 100, 100) == 59
+
+
+def test_image2short():
+    im = Image.new("RGB", (256, 3))
+    for x in range(256):
+        im.putpixel((x, 0), (x, 0, 0))
+        im.putpixel((x, 1), (0, x, 0))
+        im.putpixel((x, 2), (x, x, 255 - x))
+    assert list(image2short(im)) == [rgb2short(*rgb) for rgb in im.getdata()]
+
+
+def test_palette_greyscale():
+    palette = get_palette(greyscale=True)
+    assert palette.rgb2short(100, 100, 100) == 241
+    assert palette.rgb2short(0, 0, 0) == 16
+    assert palette.rgb2short(255, 0, 0) == 196
+
+
+def test_palette_system_colors():
+    palette = get_palette(greyscale=False, system_colors=True)
+    assert palette.rgb2short(0xcd, 0, 0) == 1
+    assert palette.rgb2short(100, 100, 100) == 59
+    assert get_palette(greyscale=False).rgb2short(0xcd, 0, 0) == 160
+
+
+def test_palette_image2short():
+    im = Image.new("RGB", (256, 3))
+    for x in range(256):
+        im.putpixel((x, 0), (x, x, x))
+        im.putpixel((x, 1), (x, 255 - x, 0))
+        im.putpixel((x, 2), (x // 2, 0, x))
+    palette = get_palette(greyscale=True, system_colors=True)
+    assert list(palette.image2short(im)) == [palette.rgb2short(*rgb) for rgb in im.getdata()]
@@ -9,7 +9,7 @@ Tests for :py:class:`luma.emulator.device.emulator`.
 
 from unittest.mock import patch
 
-from luma.emulator.device import emulator
+from luma.emulator.device import emulator, headless
 
 import pytest
 
@@ -53,3 +53,106 @@ def test_pygame_missing():
         with pytest.raises(RuntimeError) as ex:
             emulator(1, 2, 3, 4, 5, 6)
         assert str(ex.value) == 'Emulator requires pygame to be installed'
+
+
+def test_pygame_not_needed():
+    with patch.dict('sys.modules', {'pygame': None}):
+        device = headless(width=4, height=2, transform='none')
+        device.display(Image.new('RGB', (4, 2), 'red'))
+        assert device.frame().getpixel((0, 0)) == (255, 0, 0)
+
+        with pytest.raises(RuntimeError):
+            device.to_surface(device.frame())
+
+
+@pytest.mark.parametrize("transform,scale", [("scale2x", 2), ("led_matrix", 4)])
+def test_pil_backend(transform, scale):
+    im = Image.new('RGB', (8, 4))
+    ImageDraw.Draw(im).line((0, 0, 8, 4), fill='red')
+    expected = headless(width=8, height=4, transform=transform, scale=scale)
+    expected.display(im)
+
+    with patch.dict('sys.modules', {'pygame': None}):
+        device = headless(width=8, height=4, transform=transform, scale=scale, backend='pil')
+        device.display(im)
+
+    assert device.compare(expected.frame()) is None
+
+
+@pytest.mark.parametrize("transform", ["none", "identity", "scale2x", "smoothscale", "led_matrix", "seven_segment"])
+@pytest.mark.parametrize("alpha", [1.0, 0.5])
+def test_to_image(transform, alpha):
+    w, h = 37, 13
+    device = emulator(w, h, 0, 'RGB', transform, 2)
+
+    im = Image.new('RGB', (w, h))
+    dr = ImageDraw.Draw(im)
+    dr.ellipse((2, 2, w - 2, h - 2), fill='red', outline='blue')
+    dr.line((0, 0, w, h), fill='white')
+
+    surf = device.to_surface(im, alpha=alpha)
+    expected = Image.frombytes('RGB', surf.get_size(), pygame.image.tostring(surf, 'RGB'))
+    actual = device.to_image(im, alpha=alpha)
+
+    assert actual.mode == 'RGB'
+    assert actual.tobytes() == expected.tobytes()
+
+
+def test_to_surface_reuse():
+    device = emulator(4, 4, 0, 'RGB', 'scale2x', 2)
+    im = Image.new('RGB', (4, 4), 'red')
+
+    surf = device.to_surface(im, reuse=True)
+    assert device.to_surface(im, reuse=True) is surf
+    assert device.to_surface(im) is not surf
+
+
+@pytest.mark.parametrize("mode", ["1", "L", "RGB", "RGBA"])
+def test_contrast_blend(mode):
+    device = emulator(16, 16, 0, 'RGB', 'none', 1)
+    im = Image.frombytes('L', (16, 16), bytes(range(256))).convert(mode)
+
+    for value in [0, 1, 0x7F, 0x80, 0xFE]:
+        alpha = value / 255.0
+        black = Image.new('RGBA', im.size, 'black')
+        expected = Image.blend(black, im.convert('RGBA'), alpha).convert('RGB')
+        assert device.to_image(im, alpha=alpha).convert('RGB').tobytes() == expected.tobytes()
+
+
+def test_contrast_unchanged():
+    device = emulator(1, 2, 3, 'RGB', 'none', 6)
+    device._last_image = Image.new('RGB', (1, 2))
+    with patch.object(device, 'display') as display:
+        device.contrast(0xFF)
+        display.assert_not_called()
+
+        device.contrast(0x80)
+        display.assert_called_once_with(device._last_image)
+
+
+@pytest.mark.parametrize("transform", ["none", "identity", "scale2x", "smoothscale", "led_matrix", "seven_segment"])
+@pytest.mark.parametrize("alpha", [1.0, 0.5])
+def test_monochrome(transform, alpha):
+    w, h = 37, 13
+    device = emulator(w, h, 0, '1', transform, 2)
+
+    im = Image.new('1', (w, h))
+    dr = ImageDraw.Draw(im)
+    dr.ellipse((2, 2, w - 2, h - 2), outline='white')
+    dr.line((0, 0, w, h), fill='white')
+
+    # Rendered through a palettized surface, but no different to RGB
+    surf = device.to_surface(im, alpha=alpha)
+    expected = device.to_surface(im.convert('RGB'), alpha=alpha)
+    assert pygame.image.tostring(surf, 'RGB') == pygame.image.tostring(expected, 'RGB')
+    if transform in ["none", "identity", "scale2x"]:
+        assert surf.get_bitsize() == 8
+
+    # A reused surface picks up the contrast, whatever it was last rendered with
+    device.to_surface(im, alpha=1.0, reuse=True)
+    surf = device.to_surface(im, alpha=alpha, reuse=True)
+    assert pygame.image.tostring(surf, 'RGB') == pygame.image.tostring(expected, 'RGB')
+
+    actual = device.to_image(im, alpha=alpha)
+    assert actual.mode == ('RGB' if transform in ["smoothscale", "led_matrix", "seven_segment"] else 'L')
+    assert actual.convert('RGB').tobytes() == device.to_image(im.convert('RGB'), alpha=alpha).tobytes()
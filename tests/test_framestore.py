@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 Richard Hull and contributors
+# See LICENSE.rst for details.
+
+"""
+Tests for :py:class:`luma.emulator.framestore.framestore`.
+"""
+
+import random
+
+import pytest
+
+from PIL import Image, ImageChops
+
+from luma.emulator.framestore import framestore
+
+
+def noisy_image(seed, mode="RGB", size=(64, 32)):
+    rnd = random.Random(seed)
+    return Image.frombytes(mode, size, bytes(rnd.getrandbits(8) for _ in range(len(mode) * size[0] * size[1])))
+
+
+def assert_frames(store, images, durations):
+    assert len(store) == len(images)
+    assert store.durations() == durations
+    assert store.duration == sum(durations)
+    for (actual, duration), expected, expected_duration in zip(store, images, durations):
+        assert actual.mode == expected.mode
+        assert ImageChops.difference(actual, expected).getbbox() is None
+        assert duration == expected_duration
+
+
+@pytest.mark.parametrize("mode", ["L", "RGB"])
+def test_roundtrip(mode):
+    images = [noisy_image(i, mode) for i in range(3)]
+    store = framestore()
+    for image in images:
+        store.append(image, 10)
+    store.extend(20)
+
+    assert_frames(store, images, [10, 10, 30])
+    assert store.nbytes > 0
+
+
+def test_compressed():
+    store = framestore()
+    store.append(Image.new("RGB", (256, 128), "red"), 10)
+    assert store.nbytes < 256 * 128 * 3 // 100
+
+
+def test_memory_budget():
+    images = [noisy_image(i) for i in range(10)]
+    store = framestore(memory=20000)
+    for image in images:
+        store.append(image, 10)
+        assert store.nbytes <= 20000
+
+    assert store._spilled
+    assert_frames(store, images, [10] * 10)
+
+
+def test_window():
+    images = [noisy_image(i) for i in range(10)]
+    store = framestore(window=35)
+    for image in images:
+        store.append(image, 10)
+
+    assert_frames(store, images[-4:], [10] * 4)
+
+    # A long enough frame displaces all the others
+    store.extend(30)
+    assert_frames(store, images[-1:], [40])
+
+
+def test_window_spilled():
+    images = [noisy_image(i) for i in range(40)]
+    store = framestore(memory=10000, window=50)
+    for image in images:
+        store.append(image, 10)
+        assert store.nbytes <= 10000
+
+    # Space used by evicted frames is reclaimed
+    assert store._file_size <= 2 * store._spilled_size + 10000 + images[0].width * images[0].height * 3
+    assert_frames(store, images[-5:], [10] * 5)
+
+
+def test_clear():
+    store = framestore(memory=0)
+    store.append(noisy_image(0), 10)
+    store.clear()
+
+    assert len(store) == 0
+    assert store.duration == 0
+    assert store._file is None
+    assert list(store) == []
+
+
+def test_getitem():
+    images = [noisy_image(i) for i in range(5)]
+    store = framestore(memory=10000)
+    for n, image in enumerate(images):
+        store.append(image, n)
+
+    for index in [0, 2, 4, -1, -5]:
+        actual, duration = store[index]
+        assert ImageChops.difference(actual, images[index]).getbbox() is None
+        assert duration == list(range(5))[index]
+
+    with pytest.raises(IndexError):
+        store[5]
+
+
+def test_images():
+    images = [noisy_image(i) for i in range(3)]
+    store = framestore(memory=0)
+    for image in images:
+        store.append(image, 10)
+
+    view = store.images(1)
+    for _ in range(2):
+        actual = list(view)
+        assert len(actual) == 2
+        for im, expected in zip(actual, images[1:]):
+            assert ImageChops.difference(im, expected).getbbox() is None
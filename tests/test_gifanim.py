@@ -10,7 +10,7 @@ Tests for :py:class:`luma.emulator.device.gifanim`.
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 
-from PIL import Image
+from PIL import Image, ImageChops
 
 from luma.core.render import canvas
 from luma.emulator.device import gifanim
@@ -58,3 +58,138 @@ def test_gifanim_max_frames():
             device.display(img)
         assert str(ex.value) == '0'
     img.close()
+
+
+def test_gifanim_streaming():
+    with NamedTemporaryFile(suffix='.gif') as temp:
+        fname = temp.name
+        device = gifanim(filename=fname, streaming=True)
+
+        with canvas(device) as draw:
+            primitives(device, draw)
+
+        with canvas(device) as draw:
+            draw.text((30, 10), text="Blipvert", font=test_font, fill="white")
+
+        with canvas(device) as draw:
+            primitives(device, draw)
+
+        assert len(device._frames) == 0
+        device.write_animation()
+
+        with Image.open(fname) as actual, Image.open(get_reference_file('anim.gif')) as expected:
+            assert actual.n_frames == 3
+            for frame in range(3):
+                actual.seek(frame)
+                expected.seek(frame)
+                assert actual.info["duration"] == 10
+                assert ImageChops.difference(actual.convert("RGB"), expected.convert("RGB")).getbbox() is None
+
+
+def record_duplicate_frames(fname, streaming):
+    device = gifanim(filename=fname, streaming=streaming)
+
+    for _ in range(3):
+        with canvas(device) as draw:
+            primitives(device, draw)
+
+    with canvas(device) as draw:
+        primitives(device, draw)
+        draw.text((30, 10), text="Blipvert", font=test_font, fill="white")
+
+    device.write_animation()
+
+
+def test_gifanim_duplicate_frames():
+    with NamedTemporaryFile(suffix='.gif') as buffered, NamedTemporaryFile(suffix='.gif') as streamed:
+        record_duplicate_frames(buffered.name, streaming=False)
+        record_duplicate_frames(streamed.name, streaming=True)
+
+        with Image.open(buffered.name) as expected, Image.open(streamed.name) as actual:
+            assert expected.n_frames == actual.n_frames == 2
+            for frame, duration in enumerate([30, 10]):
+                expected.seek(frame)
+                actual.seek(frame)
+                assert expected.info["duration"] == actual.info["duration"] == duration
+                assert ImageChops.difference(actual.convert("RGB"), expected.convert("RGB")).getbbox() is None
+
+            # Only the changed region is encoded in the streamed delta frame
+            assert actual.dispose_extent != (0, 0) + actual.size
+
+
+def test_gifanim_monochrome():
+    with NamedTemporaryFile(suffix='.gif') as buffered, NamedTemporaryFile(suffix='.gif') as streamed:
+        for fname, streaming in [(buffered.name, False), (streamed.name, True)]:
+            device = gifanim(filename=fname, mode="1", streaming=streaming)
+            frames = []
+            for text in ["Blip", "Blipvert"]:
+                with canvas(device) as draw:
+                    primitives(device, draw)
+                    draw.text((30, 10), text=text, font=test_font, fill="white")
+                frames.append(device.to_image(device._last_image).convert("RGB"))
+            device.write_animation()
+
+            with Image.open(fname) as actual:
+                assert actual.n_frames == 2
+                for frame, expected in enumerate(frames):
+                    actual.seek(frame)
+                    assert ImageChops.difference(actual.convert("RGB"), expected).getbbox() is None
+
+                    # Black & white needs no more than a 2-bit color table
+                    assert len(actual.palette.palette) <= 4 * 3
+
+
+def test_gifanim_memory():
+    with NamedTemporaryFile(suffix='.gif') as temp:
+        fname = temp.name
+        device = gifanim(filename=fname, memory=0)
+
+        for text in [None, "Blipvert", None]:
+            with canvas(device) as draw:
+                if text:
+                    draw.text((30, 10), text=text, font=test_font, fill="white")
+                else:
+                    primitives(device, draw)
+
+        assert device._frames.nbytes == 0
+        device.write_animation()
+        assert_identical('anim.gif', fname)
+
+
+def test_gifanim_window():
+    with NamedTemporaryFile(suffix='.gif') as temp:
+        fname = temp.name
+        device = gifanim(filename=fname, duration=0.1, window=0.3)
+
+        for n in range(10):
+            with canvas(device) as draw:
+                draw.text((30, 10), text=str(n), font=test_font, fill="white")
+            expected = device.to_image(device._last_image).convert("RGB")
+        device.write_animation()
+
+        with Image.open(fname) as actual:
+            assert actual.n_frames == 3
+            actual.seek(2)
+            assert ImageChops.difference(actual.convert("RGB"), expected).getbbox() is None
+
+
+def test_gifanim_workers():
+    with NamedTemporaryFile(suffix='.gif') as temp:
+        fname = temp.name
+        device = gifanim(filename=fname, workers=2)
+
+        expected = []
+        for n in range(12):
+            with canvas(device) as draw:
+                primitives(device, draw)
+                draw.text((30 + n, 10), text="Blipvert", font=test_font, fill="white")
+            expected.append(device.to_image(device._last_image).convert("RGB"))
+        device.write_animation()
+
+        with Image.open(fname) as actual:
+            assert actual.n_frames == 12
+            assert actual.info["loop"] == 0
+            for frame, im in enumerate(expected):
+                actual.seek(frame)
+                assert actual.info["duration"] == 10
+                assert ImageChops.difference(actual.convert("RGB"), im).getbbox() is None
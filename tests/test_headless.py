@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 Richard Hull and contributors
+# See LICENSE.rst for details.
+
+"""
+Tests for :py:class:`luma.emulator.device.headless`.
+"""
+
+import hashlib
+
+import pytest
+
+from PIL import Image
+from luma.core.render import canvas
+from luma.emulator.device import headless
+
+from .baseline_data import primitives
+from .helpers import get_reference_file, test_font
+
+
+def draw_counter(device, n):
+    with canvas(device) as draw:
+        draw.text((10, 10), text=str(n), font=test_font, fill="white")
+
+
+def test_display():
+    device = headless(transform="none")
+    with canvas(device) as draw:
+        primitives(device, draw)
+
+    assert len(device) == device.count == 1
+    with Image.open(get_reference_file('capture.png')) as reference:
+        assert device.compare(reference) is None
+        assert device.frame().tobytes() == reference.convert("RGB").tobytes()
+
+
+def test_ring_buffer():
+    device = headless(mode="1", frames=3)
+    for n in range(5):
+        draw_counter(device, n)
+
+    assert device.count == 5
+    assert len(device) == 3
+
+    # Only the three most recent frames are held, oldest first
+    expected = headless(mode="1", frames=1)
+    for index, n in enumerate([2, 3, 4]):
+        draw_counter(expected, n)
+        assert device.compare(expected.frame(), index) is None
+        assert device.digest(index) == expected.digest()
+        assert device.digest(index - 3) == expected.digest()
+
+    frames = device.frames()
+    assert [im.mode for im in frames] == ["L"] * 3
+    assert frames[-1].size == (256, 128)
+
+    with pytest.raises(IndexError):
+        device.frame(3)
+    with pytest.raises(IndexError):
+        device.frame(-4)
+
+    device.reset()
+    assert len(device) == 0
+    with pytest.raises(IndexError):
+        device.frame()
+
+
+def test_empty():
+    device = headless()
+    assert len(device) == 0
+    with pytest.raises(IndexError):
+        device.frame()
+    with pytest.raises(IndexError):
+        device.digest()
+    with pytest.raises(IndexError):
+        device.compare(Image.new("RGB", (256, 128)))
+    assert device.frames() == []
+
+
+def test_compare():
+    device = headless(transform="none")
+    draw_counter(device, 1)
+    other = headless(transform="none")
+    draw_counter(other, 2)
+
+    left, top, right, bottom = device.compare(other.frame())
+    assert 10 <= left < right and 10 <= top < bottom
+    assert device.compare(Image.new("RGB", (1, 1))) == (0, 0, 128, 64)
+
+
+def test_digest():
+    device = headless(transform="none")
+    draw_counter(device, 1)
+
+    assert device.digest(algorithm="md5") == hashlib.md5(device.frame().tobytes()).hexdigest()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 Richard Hull and contributors
+# See LICENSE.rst for details.
+
+"""
+Tests for :py:mod:`luma.emulator.metrics`.
+"""
+
+import json
+import logging
+from tempfile import NamedTemporaryFile
+
+from luma.core.render import canvas
+from luma.emulator.device import capture
+from luma.emulator.metrics import histogram, recorder
+
+from .baseline_data import primitives
+
+
+def test_histogram():
+    hist = histogram()
+    assert hist.percentile(50) is None
+
+    for us in [1, 2, 3, 100, 1000]:
+        hist.add(us / 1e6, nbytes=10)
+
+    summary = hist.summary()
+    assert summary["count"] == 5
+    assert summary["bytes"] == 50
+    assert summary["min"] == 1e-6
+    assert summary["max"] == 1e-3
+    assert summary["p50"] == 4e-6
+    assert summary["p99"] == 1e-3
+    assert sum(n for _, n in summary["buckets"]) == 5
+
+
+def test_recorder_dump(caplog):
+    with NamedTemporaryFile(suffix=".json") as temp:
+        metrics = recorder(interval=0, filename=temp.name)
+        with caplog.at_level(logging.INFO, logger="luma.emulator.metrics"):
+            with metrics.stage("encode") as stage:
+                stage.nbytes = 42
+
+        with open(temp.name) as fp:
+            dumped = json.load(fp)
+
+    assert dumped["encode"]["count"] == 1
+    assert dumped["encode"]["bytes"] == 42
+    assert "encode: n=1" in caplog.text
+
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+def test_device_stages():
+    with NamedTemporaryFile(suffix=".png") as temp:
+        device = capture(file_template=temp.name)
+        with canvas(device) as draw:
+            primitives(device, draw)
+        assert device.metrics is None
+
+        metrics = device.instrument()
+        for _ in range(3):
+            with canvas(device) as draw:
+                primitives(device, draw)
+
+    snapshot = metrics.snapshot()
+    assert set(snapshot) == {"preprocess", "convert", "frombuffer", "transform", "save"}
+    assert all(stage["count"] == 3 for stage in snapshot.values())
+    assert snapshot["convert"]["bytes"] == 3 * device.width * device.height * 3
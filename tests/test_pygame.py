@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 Richard Hull and contributors
+# See LICENSE.rst for details.
+
+"""
+Tests for :py:class:`luma.emulator.device.pygame`.
+"""
+
+from unittest.mock import patch
+
+import pygame as pg
+import pytest
+
+from PIL import Image, ImageChops, ImageDraw
+from luma.core.render import canvas
+from luma.core.virtual import terminal
+from luma.emulator.device import pygame
+
+from .baseline_data import primitives
+from .helpers import test_font
+
+
+@pytest.fixture(autouse=True)
+def headless(monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    yield
+    pg.quit()
+
+
+def screenshot():
+    screen = pg.display.get_surface()
+    return Image.frombytes("RGB", screen.get_size(), pg.image.tostring(screen, "RGB"))
+
+
+def draw_frames(device):
+    with canvas(device) as draw:
+        primitives(device, draw)
+
+    with canvas(device) as draw:
+        primitives(device, draw)
+        draw.text((30, 10), text="Blipvert", font=test_font, fill="white")
+
+    return device._last_image
+
+
+@pytest.mark.parametrize("mode", ["1", "RGB"])
+@pytest.mark.parametrize("transform", ["none", "identity", "scale2x", "smoothscale", "led_matrix"])
+def test_dirty_region(transform, mode):
+    device = pygame(mode=mode, transform=transform, frame_rate=0)
+    with patch.object(pg.display, "update", wraps=pg.display.update) as update:
+        last_image = draw_frames(device)
+    partial = screenshot()
+
+    # Only the area around the text is redrawn, where the transform allows
+    if transform in ["none", "identity", "scale2x", "led_matrix"]:
+        (rect,), _ = update.call_args
+        assert 0 < rect.width * rect.height < partial.width * partial.height / 2
+    else:
+        update.assert_not_called()
+
+    # ...and is the same as redrawing the whole frame
+    device = pygame(mode=mode, transform=transform, frame_rate=0)
+    device.display(last_image)
+    assert ImageChops.difference(partial, screenshot()).getbbox() is None
+
+    # Dimming redraws the frame with the new contrast
+    device.contrast(0x80)
+    dimmed = screenshot()
+    device = pygame(mode=mode, transform=transform, frame_rate=0)
+    device.contrast(0x80)
+    device.display(last_image)
+    assert ImageChops.difference(dimmed, screenshot()).getbbox() is None
+    if transform != "led_matrix":
+        # LEDs are either on or off, however dim the pixel
+        assert ImageChops.difference(dimmed, partial).getbbox() is not None
+
+
+def test_unchanged_frame():
+    device = pygame(frame_rate=0)
+    with canvas(device) as draw:
+        primitives(device, draw)
+
+    with patch.object(pg.display, "flip") as flip, patch.object(pg.display, "update") as update:
+        device.display(device._last_image)
+        flip.assert_not_called()
+        update.assert_not_called()
+
+        device.contrast(0x80)
+        flip.assert_called_once()
+
+
+def test_reused_image():
+    device = pygame(frame_rate=0)
+    image = Image.new(device.mode, device.size)
+    device.display(image)
+
+    # Drawing into the image already displayed still redraws the window
+    draw = ImageDraw.Draw(image)
+    primitives(device, draw)
+    device.display(image)
+    reused = screenshot()
+
+    device = pygame(frame_rate=0)
+    device.display(image.copy())
+    assert ImageChops.difference(reused, screenshot()).getbbox() is None
+    assert reused.getbbox() is not None
+
+
+def test_terminal():
+    device = pygame(frame_rate=0)
+    term = terminal(device, animate=False)
+    term.println("hello")
+    assert screenshot().getbbox() is not None
+
+
+def test_stats():
+    device = pygame(frame_rate=0)
+    for _ in range(3):
+        with canvas(device) as draw:
+            primitives(device, draw)
+
+    stats = device.stats()
+    assert stats["submitted"] == stats["presented"] == 3
+    assert stats["dropped"] == 0
+    assert 0 <= stats["latency"]["p50"] <= stats["latency"]["p99"] <= stats["latency"]["max"]
+
+
+def test_threaded():
+    device = pygame(frame_rate=20, threaded=True)
+    for i in range(20):
+        with canvas(device) as draw:
+            draw.text((10, 10), text=str(i), font=test_font, fill="white")
+    last_image = device._last_image
+    device.cleanup()
+
+    # Frames are submitted far faster than they are presented...
+    stats = device.stats()
+    assert stats["submitted"] == 20
+    assert stats["dropped"] > 0
+    assert stats["presented"] + stats["dropped"] == stats["submitted"]
+
+    # ...but the last one is always shown
+    threaded = screenshot()
+    device = pygame(frame_rate=0)
+    device.display(last_image)
+    assert ImageChops.difference(threaded, screenshot()).getbbox() is None
@@ -4,15 +4,20 @@
 # See LICENSE.rst for details.
 
 """
-Tests for :py:class:`luma.emulator.render.transformer`.
+Tests for :py:class:`luma.emulator.render.transformer` and
+:py:class:`luma.emulator.render.image_transformer`.
 """
 
+from unittest.mock import patch
+
 import pygame
+import pytest
 
 from PIL import Image, ImageChops
 from luma.core.device import dummy
 from luma.core.render import canvas
-from luma.emulator.render import transformer
+from luma.emulator import render
+from luma.emulator.render import transformer, image_transformer
 
 from .helpers import get_reference_file, test_font
 
@@ -70,7 +75,10 @@ def test_identity():
         assert bbox is None
 
 
-def test_led_matrix():
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_led_matrix(vectorized, monkeypatch):
+    if not vectorized:
+        monkeypatch.setattr(render, "numpy", None)
     with open(get_reference_file("led_matrix.png"), "rb") as fp:
         ref = Image.open(fp)
         device = dummy(width=40, height=24)
@@ -85,7 +93,10 @@ def test_led_matrix():
         assert bbox is None
 
 
-def test_seven_segment():
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_seven_segment(vectorized, monkeypatch):
+    if not vectorized:
+        monkeypatch.setattr(render, "numpy", None)
     with open(get_reference_file("seven_segment.png"), "rb") as fp:
         ref = Image.open(fp)
         chars = [
@@ -107,6 +118,77 @@ def test_seven_segment():
                         draw.point((device.width - x, y), fill="white")
         surface = to_pygame_surface(device.image)
         tf = transformer(pygame, device.width, device.height, 16)
+
+        # Only the digits which change get redrawn on the second frame
+        eights = pygame.Surface(surface.get_size())
+        eights.fill((255, 255, 255), (0, 0, device.width // 2, 7))
+        tf.seven_segment(eights)
+
         im = to_pillow_img(tf.seven_segment(surface))
         bbox = ImageChops.difference(ref, im).getbbox()
         assert bbox is None
+
+
+def test_led_matrix_reuse():
+    tf = transformer(pygame, 40, 24, 16)
+    for n in range(4):
+        device = dummy(width=40, height=24)
+        with canvas(device) as draw:
+            draw.text((n, 2), "Hello", font=test_font, fill="white")
+        surface = to_pygame_surface(device.image)
+
+        # Only the LEDs which changed are redrawn, giving the same result
+        expected = to_pillow_img(tf.led_matrix(surface))
+        actual = to_pillow_img(tf.led_matrix(surface, reuse=True))
+        assert ImageChops.difference(expected, actual).getbbox() is None
+
+
+def test_sprites_shared():
+    with patch.object(pygame.image, 'load', wraps=pygame.image.load) as load:
+        render._sprite.cache_clear()
+        for _ in range(2):
+            tf = transformer(pygame, 8, 8, 16)
+            tf.led_matrix(pygame.Surface((8, 8)))
+        assert load.call_count == 2
+
+
+def sample_image():
+    device = dummy(width=40, height=24)
+    with canvas(device) as draw:
+        draw.rectangle(device.bounding_box, outline="white")
+        draw.ellipse((2, 2, 20, 20), fill="red", outline="blue")
+        draw.text((22, 2), "Hi", font=test_font, fill="yellow")
+    return device.image.convert("RGB")
+
+
+@pytest.mark.parametrize("vectorized", [True, False])
+@pytest.mark.parametrize("transform,scale", [
+    ("none", 1),
+    ("scale2x", 2),
+    ("smoothscale", 2),
+    ("identity", 3),
+    ("led_matrix", 6),
+    ("seven_segment", 8),
+])
+def test_image_transformer_matches(transform, scale, vectorized, monkeypatch):
+    if not vectorized:
+        monkeypatch.setattr(render, "numpy", None)
+    im = sample_image()
+    expected = to_pillow_img(getattr(transformer(pygame, 40, 24, scale), transform)(to_pygame_surface(im)))
+    actual = getattr(image_transformer(40, 24, scale), transform)(im)
+    assert actual.size == expected.size
+    if transform == "smoothscale" and not vectorized:
+        # Bilinear resampling only approximates pygame's filter
+        return
+    assert ImageChops.difference(expected, actual.convert("RGB")).getbbox() is None
+
+
+def test_image_transformer_led_matrix_repeated():
+    tf = image_transformer(40, 24, 6)
+    first = tf.led_matrix(sample_image())
+    expected = first.copy()
+
+    # Later frames are not drawn into an image already returned
+    second = tf.led_matrix(Image.new("RGB", (40, 24)))
+    assert ImageChops.difference(expected, first).getbbox() is None
+    assert ImageChops.difference(expected, second).getbbox() is not None
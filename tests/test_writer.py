@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 Richard Hull and contributors
+# See LICENSE.rst for details.
+
+"""
+Tests for :py:class:`luma.emulator.writer.background_writer`.
+"""
+
+import threading
+
+from luma.emulator.writer import background_writer
+
+
+def blocked_writer(overflow):
+    """
+    Returns a writer whose single worker is stuck on the first item until
+    the returned event is set.
+    """
+    started = threading.Event()
+    release = threading.Event()
+    written = []
+    dropped = []
+
+    def write(item):
+        started.set()
+        release.wait()
+        written.append(item)
+
+    writer = background_writer(write, workers=1, maxsize=2, overflow=overflow,
+                               on_drop=dropped.append)
+    writer.submit(0)
+    started.wait()
+    return writer, release, written, dropped
+
+
+def test_block():
+    written = []
+    writer = background_writer(written.append, workers=3, maxsize=1)
+    for i in range(100):
+        assert writer.submit(i)
+    writer.join()
+    assert sorted(written) == list(range(100))
+    assert writer.dropped == 0
+
+
+def test_drop_newest():
+    writer, release, written, dropped = blocked_writer("drop_newest")
+    assert [writer.submit(i) for i in range(1, 5)] == [True, True, False, False]
+    release.set()
+    writer.join()
+    assert written == [0, 1, 2]
+    assert dropped == [3, 4]
+    assert writer.dropped == 2
+
+
+def test_drop_oldest():
+    writer, release, written, dropped = blocked_writer("drop_oldest")
+    assert all(writer.submit(i) for i in range(1, 5))
+    release.set()
+    writer.join()
+    assert written == [0, 3, 4]
+    assert dropped == [1, 2]
+    assert writer.dropped == 2
+
+
+def test_error_does_not_stop_worker():
+    written = []
+
+    def write(item):
+        if item == 1:
+            raise IOError("disk full")
+        written.append(item)
+
+    writer = background_writer(write)
+    for i in range(3):
+        writer.submit(i)
+    writer.join()
+    assert written == [0, 2]